@@ -32,6 +32,7 @@ class Settings(BaseSettings):
     PRODA_MINOR_ID: str = ""
     PRODA_JKS_FILE_PATH: str = ""  # Local file path to JKS
     PRODA_JKS_BASE64: str = ""  # Base64-encoded JKS (alternative to file path)
+    PRODA_PRIVATE_KEY_DER_PATH: str = ""  # Unencrypted PKCS#8 DER key; skips the keystore
     PRODA_JKS_PASSWORD: str = "Pass-123"  # SoapUI default
     PRODA_KEY_ALIAS: str = "proda-alias"  # SoapUI default
     PRODA_JWT_AUDIENCE: str = "https://proda.humanservices.gov.au"
@@ -39,6 +40,7 @@ class Settings(BaseSettings):
     PRODA_ACCESS_TOKEN_AUDIENCE: str = "https://proda.humanservices.gov.au"
     PRODA_TOKEN_ENDPOINT_VENDOR: str = "https://vnd.proda.humanservices.gov.au/mga/sps/oauth/oauth20/token"
     PRODA_TOKEN_ENDPOINT_PROD: str = "https://proda.humanservices.gov.au/mga/sps/oauth/oauth20/token"
+    PRODA_TOKEN_EXPIRY_JITTER: float = 0.05  # Max fraction of token lifetime to expire early
 
     # === AIR API ===
     AIR_CLIENT_ID: str = ""  # X-IBM-Client-Id
@@ -47,6 +49,7 @@ class Settings(BaseSettings):
     AIR_VENDOR_BASE_URL: str = ""  # Deprecated, use AIR_API_BASE_URL_VENDOR
     AIR_PROD_BASE_URL: str = ""
     AIR_PROVIDER_NUMBER: str = ""  # Default information provider
+    AIR_DURABLE: bool = False  # fsync submission store files before renaming them into place
 
     # === JWT / Auth ===
     JWT_ALGORITHM: str = "HS256"
@@ -1,12 +1,14 @@
 """Application exception classes per claude.md coding standards."""
 
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 from fastapi import status
 
 
-# AIR error code to user-friendly message mapping
-AIR_ERROR_MESSAGES: dict[str, str] = {
+# AIR error code to user-friendly message mapping (read-only)
+AIR_ERROR_MESSAGES: Mapping[str, str] = MappingProxyType({
     # Status response codes
     "AIR-I-1007": "All encounters successfully recorded.",
     "AIR-W-1001": "Some episodes require confirmation.",
@@ -41,12 +43,13 @@ AIR_ERROR_MESSAGES: dict[str, str] = {
     "AIR-E-1087": "Route of administration is not compatible with vaccine code.",
     "AIR-E-1088": "A mandatory field is missing.",
     "AIR-E-1089": "Antenatal indicator is mandatory for this encounter.",
-}
+})
 
 
 def get_air_user_message(code: str) -> str:
     """Get user-friendly message for an AIR error/warning code."""
-    return AIR_ERROR_MESSAGES.get(code, f"AIR returned code: {code}")
+    # Only format the fallback for unknown codes
+    return AIR_ERROR_MESSAGES.get(code) or f"AIR returned code: {code}"
 
 
 class AppError(Exception):
@@ -41,19 +41,28 @@ def configure_structlog() -> None:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start background cleanup tasks for in-memory PII stores."""
+    """Start background cleanup tasks for in-memory PII stores.
+
+    On shutdown, also close the shared PRODA HTTP client.
+    """
     from app.routers.submit import _cleanup_expired_submissions
     from app.routers.bulk_history import _cleanup_expired_requests
+    from app.services.proda_auth import close_http_client
 
     task1 = asyncio.create_task(_cleanup_expired_submissions())
     task2 = asyncio.create_task(_cleanup_expired_requests())
     yield
     task1.cancel()
     task2.cancel()
+    await close_http_client()
+
 
+def create_app(with_middleware: bool = True) -> FastAPI:
+    """Create and configure the FastAPI application.
 
-def create_app() -> FastAPI:
-    """Create and configure the FastAPI application."""
+    with_middleware=False skips the CORS, security, rate-limit and logging
+    middleware, for tests that exercise routes in isolation.
+    """
     configure_structlog()
 
     app = FastAPI(
@@ -63,23 +72,24 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
-    # CORS
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[settings.FRONTEND_URL],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    if with_middleware:
+        # CORS
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=[settings.FRONTEND_URL],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
 
-    # Security headers
-    app.add_middleware(SecurityHeadersMiddleware)
+        # Security headers
+        app.add_middleware(SecurityHeadersMiddleware)
 
-    # Rate limiting
-    app.add_middleware(RateLimitMiddleware, requests_per_minute=120)
+        # Rate limiting
+        app.add_middleware(RateLimitMiddleware, requests_per_minute=120)
 
-    # Request logging
-    app.add_middleware(RequestLoggerMiddleware)
+        # Request logging
+        app.add_middleware(RequestLoggerMiddleware)
 
     # Error handlers
     app.add_exception_handler(AppError, app_error_handler)
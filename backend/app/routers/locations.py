@@ -3,12 +3,10 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.dependencies import get_current_user
-from app.models.location import LocationProvider
 from app.models.user import User
 from app.schemas.location import LocationCreate, LocationRead, LocationUpdate
 from app.schemas.provider import ProviderRead
@@ -17,14 +15,18 @@ from app.services.location_manager import LocationManager
 router = APIRouter(prefix="/api/locations", tags=["locations"])
 
 
+def get_location_manager(db: AsyncSession = Depends(get_db)) -> LocationManager:
+    """LocationManager bound to the request's DB session."""
+    return LocationManager(db)
+
+
 @router.post("", response_model=LocationRead, status_code=201)
 async def create_location(
     body: LocationCreate,
-    db: AsyncSession = Depends(get_db),
+    mgr: LocationManager = Depends(get_location_manager),
     user: User = Depends(get_current_user),
 ) -> LocationRead:
     """Create a new location with auto-assigned minor_id."""
-    mgr = LocationManager(db)
     loc = await mgr.create(
         organisation_id=body.organisation_id,
         name=body.name,
@@ -40,11 +42,10 @@ async def create_location(
 @router.get("", response_model=list[LocationRead])
 async def list_locations(
     organisation_id: int | None = None,
-    db: AsyncSession = Depends(get_db),
+    mgr: LocationManager = Depends(get_location_manager),
     user: User = Depends(get_current_user),
 ) -> list[LocationRead]:
     """List active locations."""
-    mgr = LocationManager(db)
     locs = await mgr.list_active(organisation_id)
     return [LocationRead.model_validate(loc) for loc in locs]
 
@@ -52,11 +53,10 @@ async def list_locations(
 @router.get("/{location_id}", response_model=LocationRead)
 async def get_location(
     location_id: int,
-    db: AsyncSession = Depends(get_db),
+    mgr: LocationManager = Depends(get_location_manager),
     user: User = Depends(get_current_user),
 ) -> LocationRead:
     """Get a single location by ID."""
-    mgr = LocationManager(db)
     loc = await mgr.get(location_id)
     if not loc:
         raise HTTPException(status_code=404, detail="Location not found")
@@ -67,11 +67,10 @@ async def get_location(
 async def update_location(
     location_id: int,
     body: LocationUpdate,
-    db: AsyncSession = Depends(get_db),
+    mgr: LocationManager = Depends(get_location_manager),
     user: User = Depends(get_current_user),
 ) -> LocationRead:
     """Update a location (minor_id is immutable)."""
-    mgr = LocationManager(db)
     loc = await mgr.update(location_id, **body.model_dump(exclude_none=True))
     if not loc:
         raise HTTPException(status_code=404, detail="Location not found")
@@ -81,11 +80,10 @@ async def update_location(
 @router.delete("/{location_id}", response_model=LocationRead)
 async def deactivate_location(
     location_id: int,
-    db: AsyncSession = Depends(get_db),
+    mgr: LocationManager = Depends(get_location_manager),
     user: User = Depends(get_current_user),
 ) -> LocationRead:
     """Soft-delete a location (sets status to inactive)."""
-    mgr = LocationManager(db)
     loc = await mgr.deactivate(location_id)
     if not loc:
         raise HTTPException(status_code=404, detail="Location not found")
@@ -95,7 +93,7 @@ async def deactivate_location(
 @router.get("/{location_id}/setup-status")
 async def get_setup_status(
     location_id: int,
-    db: AsyncSession = Depends(get_db),
+    mgr: LocationManager = Depends(get_location_manager),
     user: User = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Return complete setup status for a location.
@@ -103,18 +101,15 @@ async def get_setup_status(
     Includes location details, linked providers, HW027 statuses,
     PRODA link status, and provider verification results.
     """
-    mgr = LocationManager(db)
     loc = await mgr.get(location_id)
     if not loc:
         raise HTTPException(status_code=404, detail="Location not found")
 
-    # Fetch linked providers
-    result = await db.execute(
-        select(LocationProvider)
-        .where(LocationProvider.location_id == location_id)
-        .order_by(LocationProvider.created_at)
-    )
-    providers = [ProviderRead.model_validate(p) for p in result.scalars().all()]
+    # Linked providers arrive with the location (selectin relationship)
+    providers = [
+        ProviderRead.model_validate(p)
+        for p in sorted(loc.providers, key=lambda p: p.created_at)
+    ]
 
     # Compute setup completeness
     has_location = True
@@ -12,9 +12,11 @@ from __future__ import annotations
 
 import csv
 import io
+from collections.abc import AsyncIterator, Iterator
 from typing import Any
 from uuid import uuid4
 
+import orjson
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
@@ -34,6 +36,9 @@ logger = structlog.get_logger(__name__)
 
 _store = SubmissionStore()
 
+# Export rows buffered per streamed chunk
+_CSV_ROWS_PER_CHUNK = 100
+
 
 class SubmissionResultResponse(BaseModel):
     id: str
@@ -97,23 +102,21 @@ def _build_record(
     individual = _build_individual_data(request_payload)
     encounter = _build_encounter_data(request_payload)
 
+    # Index request vaccine codes by (encounter id, episode id) once, rather
+    # than rescanning the request for every AIR episode. Episodes are walked
+    # in reverse so the first episode with a repeated id wins.
+    vaccine_by_episode = {
+        (str(req_enc.get("id", "")), str(req_ep.get("id", ""))): req_ep.get("vaccineCode", "")
+        for req_enc in request_payload.get("encounters", [])
+        for req_ep in reversed(req_enc.get("episodes", []))
+    }
+
     # Map episode results with vaccine code from request
     episodes = []
-    request_encounters = request_payload.get("encounters", [])
     for ep in parsed.get("air_episodes", []):
-        # Find matching vaccine code from request
-        vaccine = ""
-        enc_id = ep.get("encounterId", "")
-        ep_id = ep.get("id", "")
-        for req_enc in request_encounters:
-            if str(req_enc.get("id", "")) == enc_id:
-                for req_ep in req_enc.get("episodes", []):
-                    if str(req_ep.get("id", "")) == ep_id:
-                        vaccine = req_ep.get("vaccineCode", "")
-                        break
         episodes.append({
             "id": ep["id"],
-            "vaccine": vaccine,
+            "vaccine": vaccine_by_episode.get((ep.get("encounterId", ""), ep.get("id", "")), ""),
             "status": ep.get("status", ""),
             "code": ep.get("code", ""),
             "message": ep.get("message", ""),  # VERBATIM
@@ -247,18 +250,16 @@ async def get_submission_results(
 
 def _load_payload(submission_id: str, encounter_index: int, kind: str) -> dict[str, Any] | None:
     """Load a request or response payload JSON file."""
-    import json
-
     prefix = f"{encounter_index:03d}"
     path = _store._base / submission_id / "payloads" / f"{prefix}_{kind}.json"
     if not path.exists():
         return None
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = orjson.loads(path.read_bytes())
         # Remove internal timestamp
         data.pop("_timestamp", None)
         return data
-    except (json.JSONDecodeError, OSError):
+    except (orjson.JSONDecodeError, OSError):
         return None
 
 
@@ -288,7 +289,7 @@ async def resubmit_record(
     # Get PRODA token and create AIR client
     proda = ProdaAuthService()
     token = await proda.get_token()
-    air_client = AIRClient(access_token=token)
+    air_client = AIRClient(access_token=token, proda=proda)
     resubmit_service = ResubmitService(air_client)
 
     # Get information provider from submission metadata
@@ -378,7 +379,7 @@ async def confirm_record(
     # Get PRODA token and confirm
     proda = ProdaAuthService()
     token = await proda.get_token()
-    air_client = AIRClient(access_token=token)
+    air_client = AIRClient(access_token=token, proda=proda)
     confirm_service = ConfirmService(air_client)
 
     result = await confirm_service.confirm_record(
@@ -433,7 +434,7 @@ async def confirm_all_warnings(submission_id: str, user: User = Depends(get_curr
     # Get PRODA token once for all confirmations
     proda = ProdaAuthService()
     token = await proda.get_token()
-    air_client = AIRClient(access_token=token)
+    air_client = AIRClient(access_token=token, proda=proda)
     confirm_service = ConfirmService(air_client)
 
     confirmed = 0
@@ -593,27 +594,36 @@ async def export_results(
         record = _build_record(row_num, request_payload, response_payload or {}, parsed)
         records.append(record)
 
-    # Build CSV
-    buf = io.StringIO()
-    writer = csv.writer(buf)
+    filename = f"air-results-{submission_id[:8]}.csv"
+
+    return StreamingResponse(
+        _iter_csv(_export_rows(submission_id, metadata, records)),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 
+def _export_rows(
+    submission_id: str, metadata: dict[str, Any], records: list[dict[str, Any]]
+) -> Iterator[list[Any]]:
+    """Yield the export report one CSV row at a time."""
     # Header section
-    writer.writerow(["AIR Submission Results Report"])
-    writer.writerow(["Submission ID", submission_id])
-    writer.writerow(["Completed", metadata.get("completedAt", "")])
-    writer.writerow(["Environment", metadata.get("environment", "VENDOR_TEST")])
-    writer.writerow([])
+    yield ["AIR Submission Results Report"]
+    yield ["Submission ID", submission_id]
+    yield ["Completed", metadata.get("completedAt", "")]
+    yield ["Environment", metadata.get("environment", "VENDOR_TEST")]
+    yield []
 
     # Summary
     success_count = sum(1 for r in records if r["status"] == "SUCCESS")
     warning_count = sum(1 for r in records if r["status"] == "WARNING")
     error_count = sum(1 for r in records if r["status"] == "ERROR")
-    writer.writerow(["Total", "Success", "Warning", "Error"])
-    writer.writerow([len(records), success_count, warning_count, error_count])
-    writer.writerow([])
+    yield ["Total", "Success", "Warning", "Error"]
+    yield [len(records), success_count, warning_count, error_count]
+    yield []
 
     # Detail rows
-    writer.writerow([
+    yield [
         "Row", "Status", "AIR Code", "AIR Message",
         "First Name", "Last Name", "DOB", "Gender",
         "Medicare", "IRN",
@@ -621,7 +631,7 @@ async def export_results(
         "Vaccine Type", "Route", "Provider",
         "Claim ID", "Action Required",
         "Errors", "Episodes",
-    ])
+    ]
 
     for rec in records:
         ind = rec.get("individual", {})
@@ -632,7 +642,7 @@ async def export_results(
         episodes_str = "; ".join(
             f"{ep.get('vaccine', '')} ({ep['status']})" for ep in rec.get("episodes", [])
         )
-        writer.writerow([
+        yield [
             rec["rowNumber"],
             rec["status"],
             rec["airStatusCode"],
@@ -654,13 +664,26 @@ async def export_results(
             rec["actionRequired"],
             errors_str,
             episodes_str,
-        ])
+        ]
 
-    buf.seek(0)
-    filename = f"air-results-{submission_id[:8]}.csv"
 
-    return StreamingResponse(
-        iter([buf.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+async def _iter_csv(rows: Iterator[list[Any]]) -> AsyncIterator[str]:
+    """Encode rows with csv.writer, yielding every _CSV_ROWS_PER_CHUNK rows.
+
+    The StringIO is emptied after each chunk, so the full report text is
+    never held in memory. An async generator keeps Starlette from handing
+    each chunk to the threadpool.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending == _CSV_ROWS_PER_CHUNK:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+            pending = 0
+    if pending:
+        yield buf.getvalue()
@@ -221,7 +221,9 @@ async def _run_submission(submission_id: str) -> None:
 
             proda = ProdaAuthService()
             token = await proda.get_token()
-            client = AIRClient(access_token=token, location_minor_id=location_minor_id)
+            client = AIRClient(
+                access_token=token, location_minor_id=location_minor_id, proda=proda
+            )
             service = BatchSubmissionService(
                 client, submission_id=submission_id, store=_store
             )
@@ -394,7 +396,9 @@ async def confirm_records(submission_id: str, request: ConfirmRequest, user: Use
             )
             proda = ProdaAuthService()
             token = await proda.get_token()
-            air_client = AIRClient(access_token=token, location_minor_id=confirm_minor_id)
+            air_client = AIRClient(
+                access_token=token, location_minor_id=confirm_minor_id, proda=proda
+            )
             confirm_service = ConfirmService(air_client)
             result = await confirm_service.confirm_record(
                 original_payload, claim_id, claim_seq, dob_iso
@@ -4,8 +4,8 @@ Covers the upload, validation, processing, and download workflow
 for fetching immunisation histories for multiple individuals via AIR API.
 """
 
-from pydantic import BaseModel, Field
-from typing import Any
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, NotRequired, TypedDict
 
 
 # ============================================================================
@@ -30,10 +30,22 @@ class BulkHistoryRecord(BaseModel):
 # ============================================================================
 
 class BulkHistoryValidateRequest(BaseModel):
-    """Request body for the validate endpoint."""
+    """Request body for the validate endpoint.
+
+    Records stay plain dicts; field-level checks happen in IndividualValidator.
+    Only the row number is required here since errors are keyed by it.
+    """
     records: list[dict[str, Any]]
     providerNumber: str = Field(..., min_length=6, max_length=8)
 
+    @field_validator("records")
+    @classmethod
+    def require_row_numbers(cls, v: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for record in v:
+            if "rowNumber" not in record:
+                raise ValueError("Each record must include a rowNumber")
+        return v
+
 
 class BulkHistoryValidateResponse(BaseModel):
     """Response from the validate endpoint."""
@@ -80,36 +92,40 @@ class BulkHistoryProgress(BaseModel):
 
 # ============================================================================
 # Result Records
+#
+# Internal shapes built by the processing task and stored in memory; they are
+# never parsed from client input, so they are plain TypedDicts rather than
+# validated models.
 # ============================================================================
 
-class HistoryResultEntry(BaseModel):
+class HistoryResultEntry(TypedDict, total=False):
     """A single vaccination history entry for an individual."""
-    dateOfService: str | None = None
-    vaccineCode: str | None = None
-    vaccineDescription: str | None = None
-    vaccineDose: str | None = None
-    routeOfAdministration: str | None = None
-    status: str | None = None
-    informationCode: str | None = None
-    informationText: str | None = None
+    dateOfService: str | None
+    vaccineCode: str | None
+    vaccineDescription: str | None
+    vaccineDose: str | None
+    routeOfAdministration: str | None
+    status: str | None
+    informationCode: str | None
+    informationText: str | None
 
 
-class DueVaccineEntry(BaseModel):
+class DueVaccineEntry(TypedDict, total=False):
     """A vaccine due for an individual."""
-    antigenCode: str | None = None
-    doseNumber: str | None = None
-    dueDate: str | None = None
+    antigenCode: str | None
+    doseNumber: str | None
+    dueDate: str | None
 
 
-class IndividualHistoryResult(BaseModel):
+class IndividualHistoryResult(TypedDict):
     """History result for a single individual."""
     rowNumber: int
     status: str  # success, error, skipped
-    statusCode: str | None = None
-    message: str | None = None
-    firstName: str | None = None
-    lastName: str | None = None
-    dateOfBirth: str | None = None
-    medicareCardNumber: str | None = None
-    immunisationHistory: list[HistoryResultEntry] = []
-    vaccineDueDetails: list[DueVaccineEntry] = []
+    statusCode: NotRequired[str | None]
+    message: NotRequired[str | None]
+    firstName: NotRequired[str | None]
+    lastName: NotRequired[str | None]
+    dateOfBirth: NotRequired[str | None]
+    medicareCardNumber: NotRequired[str | None]
+    immunisationHistory: NotRequired[list[HistoryResultEntry]]
+    vaccineDueDetails: NotRequired[list[DueVaccineEntry]]
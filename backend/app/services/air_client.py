@@ -13,6 +13,7 @@ import structlog
 
 from app.config import settings
 from app.exceptions import AIRApiError
+from app.services.proda_auth import ProdaAuthService
 
 logger = structlog.get_logger(__name__)
 
@@ -30,10 +31,13 @@ class AIRClient:
         access_token: str = "",
         correlation_id: str | None = None,
         location_minor_id: str | None = None,
+        proda: ProdaAuthService | None = None,
     ) -> None:
         self._access_token = access_token
         self._correlation_id = correlation_id or f"urn:uuid:{uuid4()}"
         self._location_minor_id = location_minor_id
+        # When set, a 401 drops the shared PRODA token and retries once with a fresh one
+        self._proda = proda
 
     def set_access_token(self, token: str) -> None:
         self._access_token = token
@@ -102,6 +106,11 @@ class AIRClient:
 
                 if response.status_code == 401 and attempt == 0:
                     logger.warning("air_api_auth_expired", attempt=attempt)
+                    if self._proda is not None:
+                        self._proda.clear_token()
+                        self.set_access_token(await self._proda.get_token())
+                        headers = {**headers, "Authorization": f"Bearer {self._access_token}"}
+                        return await self._submit_with_retry(url, headers, payload, attempt + 1)
                     raise AIRApiError(
                         message="PRODA token expired or invalid",
                         status_code=401,
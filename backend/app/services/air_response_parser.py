@@ -6,12 +6,23 @@ displayed verbatim, never truncated or modified.
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+_SUCCESS_CODES = frozenset({"AIR-I-1007", "AIR-I-1100"})
+
+# Action required per response code; codes not listed need no action.
+_ACTION_BY_CODE: Mapping[str, str] = MappingProxyType({
+    "AIR-W-1001": "CONFIRM_OR_CORRECT",  # Assessment rule failure
+    "AIR-W-1004": "CONFIRM_OR_CORRECT",  # Individual not found
+    "AIR-W-1008": "CONFIRM_OR_CORRECT",  # Some encounters need confirmation
+})
+
 
 def extract_episodes(encounters: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Extract episode-level results from AIR encounter responses.
@@ -82,36 +93,19 @@ def parse_air_response(
     status_code = air_response.get("statusCode", "")
 
     # Determine record status
-    if status_code in ("AIR-I-1007", "AIR-I-1100"):
+    if status_code in _SUCCESS_CODES:
         status = "SUCCESS"
     elif status_code.startswith("AIR-W"):
         status = "WARNING"
-    elif status_code.startswith("AIR-E"):
-        status = "ERROR"
     else:
         status = "ERROR"
 
-    # Determine action required
-    action = "NONE"
-    if status_code in ("AIR-W-1004", "AIR-W-1008"):
-        action = "CONFIRM_OR_CORRECT"
+    action = _ACTION_BY_CODE.get(status_code, "NONE")
 
     # Extract claim details
     claim_details = air_response.get("claimDetails", {}) or {}
     encounters = claim_details.get("encounters", []) or []
 
-    # For AIR-W-1008, check individual encounters
-    if status_code == "AIR-W-1008" and encounters:
-        for enc in encounters:
-            info = enc.get("information", {})
-            if info.get("status") == "WARNING":
-                action = "CONFIRM_OR_CORRECT"
-                break
-
-    # For AIR-W-1001 (assessment rule failure), also needs confirm
-    if status_code == "AIR-W-1001":
-        action = "CONFIRM_OR_CORRECT"
-
     # Build encounter-level results for frontend display
     encounter_results: list[dict[str, Any]] = []
     for enc in encounters:
@@ -5,8 +5,11 @@ and returns structured data with per-row error collection.
 """
 
 import io
+import re
+from calendar import monthrange
 from datetime import datetime
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 
 import structlog
 from openpyxl import load_workbook
@@ -43,6 +46,60 @@ COLUMN_MAP: dict[str, str] = {
 }
 
 
+# Accepted date string shapes: DD/MM/YYYY, DD-MM-YYYY (day/month may be one
+# digit) and YYYY-MM-DD
+_DMY_RE = re.compile(r"^(\d{1,2})([/-])(\d{1,2})\2(\d{4})$")
+_YMD_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+
+
+# Converters return (value, error message); errors are data, not exceptions,
+# so rows with bad cells don't pay for raising and unwinding.
+Converted = tuple[Any, str | None]
+
+_GENDER_MAP: dict[str, str] = {
+    "M": "M", "MALE": "M",
+    "F": "F", "FEMALE": "F",
+    "X": "X", "NON-BINARY": "X", "NONBINARY": "X", "NOT STATED": "X", "NOTSTATED": "X",
+}
+_TRUE_VALUES = frozenset(("TRUE", "YES", "Y", "1"))
+_FALSE_VALUES = frozenset(("FALSE", "NO", "N", "0"))
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(s: str) -> Converted:
+    """Parse a stripped date string to yyyy-MM-dd.
+
+    Cached because uploads repeat the same dates (e.g. date of service)
+    across many rows.
+    """
+    m = _DMY_RE.match(s)
+    if m:
+        year, month, day = int(m[4]), int(m[3]), int(m[1])
+    else:
+        m = _YMD_RE.match(s)
+        if not m:
+            return None, f"Invalid date format: '{s}'. Expected DD/MM/YYYY."
+        year, month, day = int(m[1]), int(m[2]), int(m[3])
+    # Calendar check without try/except: day must exist in that month
+    if not (year >= 1 and 1 <= month <= 12 and 1 <= day <= monthrange(year, month)[1]):
+        return None, f"Invalid date format: '{s}'. Expected DD/MM/YYYY."
+    return f"{year:04d}-{month:02d}-{day:02d}", None
+
+
+def _numeric_string(value: Any) -> Converted:
+    """Render a numeric-ish cell (Excel may store it as float) as a string."""
+    return (str(int(value)) if isinstance(value, float) else str(value).strip()), None
+
+
+def _vaccine_dose(value: Any) -> Converted:
+    """Render a vaccine dose (a number or 'B') as an uppercase string."""
+    return _numeric_string(value)[0].upper(), None
+
+
+def _plain_string(value: Any) -> Converted:
+    return str(value).strip(), None
+
+
 class ParseError:
     """Represents a parsing error for a specific row/field."""
 
@@ -75,7 +132,8 @@ class ExcelParserService:
         if ws is None:
             raise FileProcessingError(message="Excel file has no active worksheet")
 
-        rows = list(ws.iter_rows(values_only=False))
+        # values_only yields plain tuples, skipping per-cell object creation
+        rows = list(ws.iter_rows(values_only=True))
         if len(rows) < 2:
             raise FileProcessingError(
                 message="Excel file must contain a header row and at least one data row"
@@ -91,11 +149,14 @@ class ExcelParserService:
                 detail={"expected": list(COLUMN_MAP.keys())},
             )
 
+        # Resolve each mapped column's converter once, not per cell
+        col_parsers = self._column_parsers(column_mapping)
+
         records: list[dict[str, Any]] = []
         errors: list[dict[str, Any]] = []
 
         for row_idx, row in enumerate(rows[1:], start=2):
-            record, row_errors = self._parse_row(row, column_mapping, row_idx)
+            record, row_errors = self._parse_row(row, col_parsers, row_idx)
             if record and not row_errors:
                 records.append(record)
             errors.extend(row_errors)
@@ -111,7 +172,7 @@ class ExcelParserService:
 
         return {
             "records": records,
-            "errors": [e if isinstance(e, dict) else e for e in errors],
+            "errors": errors,
             "totalRows": len(rows) - 1,
             "validRecords": len(records),
         }
@@ -119,28 +180,40 @@ class ExcelParserService:
     def _map_headers(self, header_row: tuple) -> dict[int, str]:
         """Map column indices to field names based on header text."""
         mapping: dict[int, str] = {}
-        for idx, cell in enumerate(header_row):
-            if cell.value is None:
+        for idx, value in enumerate(header_row):
+            if value is None:
                 continue
-            header = str(cell.value).strip().lower()
+            header = str(value).strip().lower()
             if header in COLUMN_MAP:
                 mapping[idx] = COLUMN_MAP[header]
         return mapping
 
+    def _column_parsers(
+        self, column_mapping: dict[int, str]
+    ) -> list[tuple[int, str, Callable[[Any], Converted]]]:
+        """Build (column index, field name, converter) triples for the sheet."""
+        return [
+            (col_idx, field_name, self._converter_for(field_name))
+            for col_idx, field_name in column_mapping.items()
+        ]
+
     def _parse_row(
-        self, row: tuple, column_mapping: dict[int, str], row_number: int
+        self,
+        row: tuple,
+        col_parsers: list[tuple[int, str, Callable[[Any], Converted]]],
+        row_number: int,
     ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
         """Parse a single data row. Returns (record, errors)."""
         errors: list[dict[str, Any]] = []
         record: dict[str, Any] = {"rowNumber": row_number}
         is_empty = True
+        row_len = len(row)
 
-        for col_idx, field_name in column_mapping.items():
-            if col_idx >= len(row):
+        for col_idx, field_name, convert in col_parsers:
+            if col_idx >= row_len:
                 continue
 
-            cell = row[col_idx]
-            value = cell.value
+            value = row[col_idx]
 
             if value is None:
                 continue
@@ -148,82 +221,63 @@ class ExcelParserService:
             is_empty = False
 
             # Convert and normalize the value
-            try:
-                parsed = self._normalize_value(field_name, value)
+            parsed, error = convert(value)
+            if error is None:
                 record[field_name] = parsed
-            except ValueError as e:
-                errors.append(
-                    ParseError(row_number, field_name, str(e)).to_dict()
-                )
+            else:
+                errors.append(ParseError(row_number, field_name, error).to_dict())
 
         if is_empty:
             return None, []
 
         return record, errors
 
-    def _normalize_value(self, field: str, value: Any) -> Any:
-        """Normalize a cell value based on the field type."""
-        if isinstance(value, str):
-            value = value.strip()
-
+    def _converter_for(self, field: str) -> Callable[[Any], Converted]:
+        """Return the value converter for a field."""
         # Date fields: convert to yyyy-MM-dd
         if field in ("dateOfBirth", "dateOfService"):
-            return self._parse_date(value)
+            return self._parse_date
 
         # Gender: normalize to single char uppercase
         if field == "gender":
-            return self._normalize_gender(value)
+            return self._normalize_gender
 
         # Boolean-like fields
         if field in ("administeredOverseas", "antenatalIndicator"):
-            return self._parse_boolean(value)
+            return self._parse_boolean
 
         # Numeric strings (Medicare, IHI, postcode)
         if field in ("medicareCardNumber", "ihiNumber", "postCode", "medicareIRN"):
-            return str(int(value)) if isinstance(value, float) else str(value)
+            return _numeric_string
 
         # Vaccine dose: could be number or 'B'
         if field == "vaccineDose":
-            v = str(int(value)) if isinstance(value, float) else str(value)
-            return v.upper()
+            return _vaccine_dose
 
-        return str(value) if value is not None else None
+        return _plain_string
 
-    def _parse_date(self, value: Any) -> str:
+    def _parse_date(self, value: Any) -> Converted:
         """Parse a date value to yyyy-MM-dd format."""
         if isinstance(value, datetime):
-            return value.strftime("%Y-%m-%d")
-
-        s = str(value).strip()
-        # Try DD/MM/YYYY and D/M/YYYY
-        for fmt in ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d"):
-            try:
-                dt = datetime.strptime(s, fmt)
-                return dt.strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-
-        raise ValueError(f"Invalid date format: '{s}'. Expected DD/MM/YYYY.")
-
-    def _normalize_gender(self, value: Any) -> str:
-        """Normalize gender to M/F/I/U/X."""
-        s = str(value).strip().upper()
-        gender_map = {
-            "M": "M", "MALE": "M",
-            "F": "F", "FEMALE": "F",
-            "X": "X", "NON-BINARY": "X", "NONBINARY": "X", "NOT STATED": "X", "NOTSTATED": "X",
-        }
-        if s in gender_map:
-            return gender_map[s]
-        raise ValueError(f"Invalid gender: '{value}'. Expected F/M/X or Female/Male/Non-binary.")
-
-    def _parse_boolean(self, value: Any) -> bool:
+            return value.strftime("%Y-%m-%d"), None
+        return _parse_date_string(str(value).strip())
+
+    def _normalize_gender(self, value: Any) -> Converted:
+        """Normalize gender to M/F/X."""
+        raw = str(value).strip()
+        gender = _GENDER_MAP.get(raw.upper())
+        if gender is None:
+            return None, f"Invalid gender: '{raw}'. Expected F/M/X or Female/Male/Non-binary."
+        return gender, None
+
+    def _parse_boolean(self, value: Any) -> Converted:
         """Parse a boolean-like value."""
         if isinstance(value, bool):
-            return value
-        s = str(value).strip().upper()
-        if s in ("TRUE", "YES", "Y", "1"):
-            return True
-        if s in ("FALSE", "NO", "N", "0"):
-            return False
-        raise ValueError(f"Invalid boolean: '{value}'. Expected TRUE/FALSE or Y/N.")
+            return value, None
+        raw = str(value).strip()
+        s = raw.upper()
+        if s in _TRUE_VALUES:
+            return True, None
+        if s in _FALSE_VALUES:
+            return False, None
+        return None, f"Invalid boolean: '{raw}'. Expected TRUE/FALSE or Y/N."
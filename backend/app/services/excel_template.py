@@ -5,6 +5,7 @@ data validation dropdowns, sample data, and an instructions sheet.
 """
 
 import io
+from functools import lru_cache
 from typing import Any
 
 import structlog
@@ -190,6 +191,21 @@ COLUMNS: list[dict[str, Any]] = [
     },
 ]
 
+COLUMN_HEADERS: tuple[str, ...] = tuple(col_def["header"] for col_def in COLUMNS)
+COLUMN_HEADER_SET: frozenset[str] = frozenset(COLUMN_HEADERS)
+
+# Column letter per field, resolved once rather than scanned per validation
+_COLUMN_LETTERS: dict[str, str] = {
+    col_def["field"]: get_column_letter(idx) for idx, col_def in enumerate(COLUMNS, start=1)
+}
+
+_THIN_BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+
 
 class ExcelTemplateService:
     """Generates Excel template files for vaccination record uploads."""
@@ -197,8 +213,13 @@ class ExcelTemplateService:
     def generate(self) -> bytes:
         """Generate an Excel template with headers, validation, sample data, and instructions.
 
-        Returns the workbook as bytes.
+        Returns the workbook as bytes. The template is fully determined by
+        COLUMNS, so it is rendered once per process and reused.
         """
+        return _render_template()
+
+    def _render(self) -> bytes:
+        """Build the workbook with openpyxl and serialize it."""
         wb = Workbook()
 
         # Create data entry sheet
@@ -213,7 +234,6 @@ class ExcelTemplateService:
         # Save to bytes
         buffer = io.BytesIO()
         wb.save(buffer)
-        buffer.seek(0)
         content = buffer.getvalue()
 
         logger.info("excel_template_generated", size_bytes=len(content))
@@ -224,12 +244,6 @@ class ExcelTemplateService:
         header_font = Font(bold=True, color="FFFFFF", size=11)
         header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
         header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
 
         # Write headers
         for col_idx, col_def in enumerate(COLUMNS, start=1):
@@ -237,13 +251,13 @@ class ExcelTemplateService:
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = header_alignment
-            cell.border = thin_border
+            cell.border = _THIN_BORDER
             ws.column_dimensions[get_column_letter(col_idx)].width = col_def["width"]
 
         # Write sample data row
         for col_idx, col_def in enumerate(COLUMNS, start=1):
             cell = ws.cell(row=2, column=col_idx, value=col_def["sample"])
-            cell.border = thin_border
+            cell.border = _THIN_BORDER
 
         # Add data validations
         self._add_validations(ws)
@@ -323,22 +337,16 @@ class ExcelTemplateService:
 
     def _get_column_letter(self, field_name: str) -> str:
         """Get the Excel column letter for a given field name."""
-        for idx, col_def in enumerate(COLUMNS, start=1):
-            if col_def["field"] == field_name:
-                return get_column_letter(idx)
-        raise ValueError(f"Unknown field: {field_name}")
+        try:
+            return _COLUMN_LETTERS[field_name]
+        except KeyError:
+            raise ValueError(f"Unknown field: {field_name}") from None
 
     def _build_instructions_sheet(self, ws: Any) -> None:
         """Build the instructions sheet explaining each column."""
         title_font = Font(bold=True, size=14)
         header_font = Font(bold=True, size=11)
         header_fill = PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid")
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
 
         # Title
         ws.cell(row=1, column=1, value="AIR Bulk Vaccination Upload — Column Reference").font = title_font
@@ -358,7 +366,7 @@ class ExcelTemplateService:
             cell = ws.cell(row=row, column=col_idx, value=h)
             cell.font = header_font
             cell.fill = header_fill
-            cell.border = thin_border
+            cell.border = _THIN_BORDER
 
         ws.column_dimensions["A"].width = 8
         ws.column_dimensions["B"].width = 28
@@ -368,13 +376,12 @@ class ExcelTemplateService:
 
         for idx, col_def in enumerate(COLUMNS):
             r = row + 1 + idx
-            col_letter = get_column_letter(idx + 1)
-            ws.cell(row=r, column=1, value=col_letter).border = thin_border
-            ws.cell(row=r, column=2, value=col_def["header"]).border = thin_border
-            ws.cell(row=r, column=3, value=col_def["required"]).border = thin_border
-            ws.cell(row=r, column=4, value=col_def["format"]).border = thin_border
+            ws.cell(row=r, column=1, value=_COLUMN_LETTERS[col_def["field"]]).border = _THIN_BORDER
+            ws.cell(row=r, column=2, value=col_def["header"]).border = _THIN_BORDER
+            ws.cell(row=r, column=3, value=col_def["required"]).border = _THIN_BORDER
+            ws.cell(row=r, column=4, value=col_def["format"]).border = _THIN_BORDER
             cell = ws.cell(row=r, column=5, value=col_def["description"])
-            cell.border = thin_border
+            cell.border = _THIN_BORDER
             cell.alignment = Alignment(wrap_text=True)
 
         # Notes section
@@ -389,3 +396,9 @@ class ExcelTemplateService:
         ]
         for i, note in enumerate(notes):
             ws.cell(row=notes_row + 1 + i, column=1, value=f"  {i + 1}. {note}")
+
+
+@lru_cache(maxsize=1)
+def _render_template() -> bytes:
+    """Render the template once; bytes are immutable so callers can share them."""
+    return ExcelTemplateService()._render()
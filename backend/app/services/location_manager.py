@@ -1,7 +1,7 @@
 """Location CRUD service with atomic minor_id assignment."""
 
 import structlog
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.location import Location, LocationProvider
@@ -210,10 +210,20 @@ class LocationManager:
     async def update_proda_link_status(
         self, location_id: int, new_status: str
     ) -> None:
-        """Update the proda_link_status for a location."""
-        location = await self.get(location_id)
-        if location and location.proda_link_status != new_status:
-            location.proda_link_status = new_status
+        """Update the proda_link_status for a location.
+
+        A single conditional UPDATE: rows already at new_status (or missing
+        locations) match nothing, so the common repeat call skips the commit.
+        """
+        result = await self._db.execute(
+            update(Location)
+            .where(
+                Location.id == location_id,
+                Location.proda_link_status.is_distinct_from(new_status),
+            )
+            .values(proda_link_status=new_status)
+        )
+        if result.rowcount:
             await self._db.commit()
             logger.info(
                 "proda_link_status_updated",
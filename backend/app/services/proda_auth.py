@@ -10,14 +10,19 @@ Key references:
 - Device reactivation required before device_expiry (62 months vendor, 6 months prod)
 """
 
+import asyncio
 import base64
 import io
+import os
+import random
 import time
+from urllib.parse import urlencode
 from uuid import uuid4
 
 import httpx
 import jwt
 import structlog
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
 
 from app.config import Settings, settings
 from app.middleware.error_handler import AuthenticationError
@@ -27,27 +32,129 @@ logger = structlog.get_logger(__name__)
 # Best practice: refresh token after 50% of lifespan (30 min of 60 min)
 TOKEN_REFRESH_BUFFER_SECONDS = 600
 
+# Client assertions are valid for 10 minutes; stop reusing one 30s before that
+ASSERTION_LIFETIME_SECONDS = 600
+ASSERTION_REUSE_MARGIN_SECONDS = 30
+
+# Routers build a ProdaAuthService per request, so the HTTP client lives at
+# module level: its SSL context (CA bundle load) is built once per process.
+# Pooled connections are rarely reused: token requests (the hourly refresh, or
+# AIRClient's re-fetch after an AIR 401) usually come long after keep-alive
+# expiry and open a new TLS connection.
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared PRODA HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=30),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared PRODA HTTP client (called on application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class _SharedState:
+    """Token, signing key and request parts shared by every service for one credential."""
+
+    def __init__(self, config: Settings) -> None:
+        self.access_token: str | None = None
+        self.token_expires_at: float = 0.0  # time.monotonic() deadline
+        self.key_expiry: str | None = None
+        self.device_expiry: str | None = None
+        self.refresh_lock = asyncio.Lock()
+        # Unwrapping the keystore is slow (PBKDF2 + 3DES), so keep the key until
+        # the key file on disk changes (see ProdaAuthService._key_file_stamp)
+        self.signing_key: PrivateKeyTypes | None = None
+        self.signing_key_stamp: tuple[str, int, int] | None = None
+        self.assertion: str | None = None
+        self.assertion_expires_at: float = 0.0  # time.monotonic() deadline
+        # Config-derived assertion parts; only iat/exp change per signature
+        self.static_claims = {
+            "iss": config.PRODA_ORG_ID,
+            "sub": config.PRODA_DEVICE_NAME,
+            "aud": config.PRODA_JWT_AUDIENCE,
+            "token.aud": config.PRODA_ACCESS_TOKEN_AUDIENCE,
+        }
+        # Match SoapUI/jose4j: kid + alg only, no "typ" header
+        self.assertion_headers = {
+            "kid": config.PRODA_DEVICE_NAME,
+            "typ": False,
+        }
+        # Form fields that never change, url-encoded once; the assertion is appended
+        self.token_form_prefix = urlencode({
+            "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+            "client_id": config.PRODA_CLIENT_ID,
+        }).encode()
+        self.token_endpoint = (
+            config.PRODA_TOKEN_ENDPOINT_PROD
+            if config.APP_ENV == "production"
+            else config.PRODA_TOKEN_ENDPOINT_VENDOR
+        )
+
+
+# Keyed on the settings that determine which token PRODA issues, so services
+# built per request with the same credentials reuse one token and one refresh
+_shared_states: dict[tuple[str, ...], _SharedState] = {}
+
+
+def _get_shared_state(config: Settings) -> _SharedState:
+    """Return the shared state for config's credentials, creating it on first use."""
+    key = (
+        config.APP_ENV,
+        config.PRODA_ORG_ID,
+        config.PRODA_DEVICE_NAME,
+        config.PRODA_CLIENT_ID,
+        config.PRODA_JWT_AUDIENCE,
+        config.PRODA_ACCESS_TOKEN_AUDIENCE,
+        config.PRODA_TOKEN_ENDPOINT_VENDOR,
+        config.PRODA_TOKEN_ENDPOINT_PROD,
+        config.PRODA_PRIVATE_KEY_DER_PATH,
+        config.PRODA_JKS_FILE_PATH,
+        config.PRODA_JKS_BASE64,
+        config.PRODA_JKS_PASSWORD,
+        config.PRODA_KEY_ALIAS,
+    )
+    state = _shared_states.get(key)
+    if state is None:
+        state = _shared_states[key] = _SharedState(config)
+    return state
+
 
 class ProdaAuthService:
     """Manages PRODA B2B token acquisition and in-memory caching.
 
     Per B2B Best Practice Guide: reuse access tokens while valid,
     track key_expiry and device_expiry from token responses.
+    Instances with the same credentials share one token (see _SharedState).
     """
 
-    def __init__(self, config: Settings | None = None) -> None:
+    def __init__(
+        self,
+        config: Settings | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
         self._config = config or settings
-        self._access_token: str | None = None
-        self._token_expires_at: float = 0.0
-        self._key_expiry: str | None = None
-        self._device_expiry: str | None = None
+        # None means the module-level shared client
+        self._http_client = http_client
+        self._state = _get_shared_state(self._config)
 
     @property
     def is_token_valid(self) -> bool:
         """Check if the cached token is still valid (with refresh buffer)."""
-        if not self._access_token:
+        state = self._state
+        if not state.access_token:
             return False
-        return time.time() < (self._token_expires_at - TOKEN_REFRESH_BUFFER_SECONDS)
+        return time.monotonic() < (state.token_expires_at - TOKEN_REFRESH_BUFFER_SECONDS)
 
     def _build_assertion(self) -> str:
         """Build a signed JWT assertion for PRODA token request.
@@ -56,41 +163,77 @@ class ProdaAuthService:
         - header: alg=RS256, kid=PRODA_DEVICE_NAME
         - payload: iss=ORG_ID, sub=DEVICE_NAME, aud=proda URL,
           token.aud=MCOL audience for AIR (Section 5.4), exp=10min
+
+        A signed assertion is reused until shortly before its own expiry.
         """
-        if not self._config.PRODA_JKS_BASE64 and not self._config.PRODA_JKS_FILE_PATH:
+        if not (
+            self._config.PRODA_JKS_BASE64
+            or self._config.PRODA_JKS_FILE_PATH
+            or self._config.PRODA_PRIVATE_KEY_DER_PATH
+        ):
             raise AuthenticationError("PRODA JKS keystore not configured")
 
+        state = self._state
+        stamp = self._key_file_stamp()
+        if stamp != state.signing_key_stamp:
+            # Key file rotated on disk: drop the old key and anything it signed
+            state.signing_key = None
+            state.assertion = None
+            state.signing_key_stamp = stamp
+
+        if state.assertion and time.monotonic() < (
+            state.assertion_expires_at - ASSERTION_REUSE_MARGIN_SECONDS
+        ):
+            return state.assertion
+
+        # JWT claims are wall-clock epoch seconds, unlike the cache deadline
         now = int(time.time())
         claims = {
-            "iss": self._config.PRODA_ORG_ID,
-            "sub": self._config.PRODA_DEVICE_NAME,
-            "aud": self._config.PRODA_JWT_AUDIENCE,
-            "token.aud": self._config.PRODA_ACCESS_TOKEN_AUDIENCE,
-            "exp": now + 600,  # 10 minutes
+            **state.static_claims,
+            "exp": now + ASSERTION_LIFETIME_SECONDS,
             "iat": now,
         }
 
-        # Match SoapUI/jose4j: kid + alg only, no "typ" header
-        headers = {
-            "kid": self._config.PRODA_DEVICE_NAME,
-            "typ": False,
-        }
-
-        # Load private key from JKS
-        private_key = self._load_private_key()
+        if state.signing_key is None:
+            state.signing_key = self._load_private_key()
 
-        return jwt.encode(
-            claims, private_key, algorithm="RS256",
-            headers=headers,
+        state.assertion = jwt.encode(
+            claims, state.signing_key, algorithm="RS256",
+            headers=state.assertion_headers,
         )
+        state.assertion_expires_at = time.monotonic() + ASSERTION_LIFETIME_SECONDS
+        return state.assertion
+
+    def _key_file_stamp(self) -> tuple[str, int, int] | None:
+        """Return (path, mtime_ns, size) of the configured key file.
+
+        None when the key comes from PRODA_JKS_BASE64, which is part of the
+        shared-state key already, or when the file cannot be stat'ed.
+        """
+        path = self._config.PRODA_PRIVATE_KEY_DER_PATH or self._config.PRODA_JKS_FILE_PATH
+        if not path:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (path, st.st_mtime_ns, st.st_size)
 
-    def _load_private_key(self) -> bytes:
-        """Load private key from keystore (JKS or PKCS12) or base64-encoded.
+    def _load_private_key(self) -> PrivateKeyTypes:
+        """Load private key from a DER file, keystore (JKS or PKCS12) or base64.
 
-        Supports both JKS (pyjks) and PKCS12 (cryptography) formats.
+        An unencrypted PKCS#8 DER key, when configured, skips the keystore's
+        password-based unwrap entirely. Otherwise supports both JKS (pyjks)
+        and PKCS12 (cryptography) formats.
         Key is loaded into memory only — never written to disk.
         """
         try:
+            if self._config.PRODA_PRIVATE_KEY_DER_PATH:
+                from cryptography.hazmat.primitives.serialization import load_der_private_key
+
+                with open(self._config.PRODA_PRIVATE_KEY_DER_PATH, "rb") as f:
+                    return load_der_private_key(f.read(), password=None)
+
             if self._config.PRODA_JKS_FILE_PATH:
                 with open(self._config.PRODA_JKS_FILE_PATH, "rb") as f:
                     store_bytes = f.read()
@@ -111,9 +254,10 @@ class ProdaAuthService:
             logger.error("keystore_load_failed", error=str(e))
             raise AuthenticationError(f"Failed to load keystore: {str(e)}")
 
-    def _load_from_jks(self, store_bytes: bytes) -> bytes:
+    def _load_from_jks(self, store_bytes: bytes) -> PrivateKeyTypes:
         """Extract private key from JKS keystore bytes."""
         import jks
+        from cryptography.hazmat.primitives.serialization import load_der_private_key
 
         keystore = jks.KeyStore.loads(store_bytes, self._config.PRODA_JKS_PASSWORD)
         alias = self._config.PRODA_KEY_ALIAS
@@ -123,16 +267,12 @@ class ProdaAuthService:
         pk_entry = keystore.private_keys[alias]
         if not pk_entry.is_decrypted():
             pk_entry.decrypt(self._config.PRODA_JKS_PASSWORD)
-        return pk_entry.pkey
+        # pyjks yields PKCS#8 DER, which jwt.encode cannot parse from bytes
+        return load_der_private_key(pk_entry.pkey, password=None)
 
-    def _load_from_pkcs12(self, store_bytes: bytes) -> bytes:
+    def _load_from_pkcs12(self, store_bytes: bytes) -> PrivateKeyTypes:
         """Extract private key from PKCS12 keystore bytes."""
-        from cryptography.hazmat.primitives.serialization import (
-            Encoding,
-            NoEncryption,
-            PrivateFormat,
-            pkcs12,
-        )
+        from cryptography.hazmat.primitives.serialization import pkcs12
 
         private_key, _cert, _chain = pkcs12.load_key_and_certificates(
             store_bytes, self._config.PRODA_JKS_PASSWORD.encode("utf-8")
@@ -140,90 +280,96 @@ class ProdaAuthService:
         if private_key is None:
             raise AuthenticationError("No private key found in PKCS12 keystore")
 
-        return private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption())
+        return private_key
 
     async def get_token(self) -> str:
-        """Get a valid PRODA access token, refreshing if needed."""
+        """Get a valid PRODA access token, refreshing if needed.
+
+        Concurrent callers that find the token stale share a single refresh,
+        across every instance built for the same credentials.
+        """
         if self.is_token_valid:
-            return self._access_token  # type: ignore[return-value]
+            return self._state.access_token  # type: ignore[return-value]
 
-        return await self._acquire_token()
+        async with self._state.refresh_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self.is_token_valid:
+                return self._state.access_token  # type: ignore[return-value]
+            return await self._acquire_token()
 
     def _get_token_endpoint(self) -> str:
         """Return the correct PRODA token endpoint for the current environment."""
-        if self._config.APP_ENV == "production":
-            return self._config.PRODA_TOKEN_ENDPOINT_PROD
-        return self._config.PRODA_TOKEN_ENDPOINT_VENDOR
+        return self._state.token_endpoint
 
     async def _acquire_token(self) -> str:
         """Acquire a new token from the PRODA token endpoint."""
         assertion = self._build_assertion()
         endpoint = self._get_token_endpoint()
+        body = self._state.token_form_prefix + b"&" + urlencode({"assertion": assertion}).encode()
 
-        async with httpx.AsyncClient() as client:
+        try:
+            client = self._http_client or _get_http_client()
+            response = await client.post(
+                endpoint,
+                content=body,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            # Log the response body for diagnosis (contains error/error_description)
+            error_body = ""
             try:
-                response = await client.post(
-                    endpoint,
-                    data={
-                        "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-                        "assertion": assertion,
-                        "client_id": self._config.PRODA_CLIENT_ID,
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                # Log the response body for diagnosis (contains error/error_description)
-                error_body = ""
-                try:
-                    error_body = e.response.text[:500]
-                except Exception:
-                    pass
-                logger.error(
-                    "proda_token_failed",
-                    status_code=e.response.status_code,
-                    response_body=error_body,
-                    token_aud=self._config.PRODA_ACCESS_TOKEN_AUDIENCE,
-                )
-                raise AuthenticationError(
-                    f"PRODA token request failed: HTTP {e.response.status_code} — {error_body}"
-                )
-            except httpx.RequestError as e:
-                logger.error("proda_token_request_error", error=str(e))
-                raise AuthenticationError(
-                    f"PRODA token request error: {str(e)}"
-                )
+                error_body = e.response.text[:500]
+            except Exception:
+                pass
+            logger.error(
+                "proda_token_failed",
+                status_code=e.response.status_code,
+                response_body=error_body,
+                token_aud=self._config.PRODA_ACCESS_TOKEN_AUDIENCE,
+            )
+            raise AuthenticationError(
+                f"PRODA token request failed: HTTP {e.response.status_code} — {error_body}"
+            )
+        except httpx.RequestError as e:
+            logger.error("proda_token_request_error", error=str(e))
+            raise AuthenticationError(
+                f"PRODA token request error: {str(e)}"
+            )
 
         token_data = response.json()
-        self._access_token = token_data["access_token"]
+        state = self._state
+        state.access_token = token_data["access_token"]
         expires_in = token_data.get("expires_in", 3600)
-        self._token_expires_at = time.time() + expires_in
+        # Expire up to PRODA_TOKEN_EXPIRY_JITTER early (never late) so services
+        # that started together do not all refresh on the same second
+        jitter = random.uniform(0.0, self._config.PRODA_TOKEN_EXPIRY_JITTER)
+        state.token_expires_at = time.monotonic() + expires_in * (1.0 - jitter)
 
         # Track key and device expiry per B2B Best Practice Guide
-        self._key_expiry = token_data.get("key_expiry")
-        self._device_expiry = token_data.get("device_expiry")
+        state.key_expiry = token_data.get("key_expiry")
+        state.device_expiry = token_data.get("device_expiry")
 
         logger.info(
             "proda_token_acquired",
             expires_in=expires_in,
             token_type=token_data.get("token_type"),
-            key_expiry=self._key_expiry,
-            device_expiry=self._device_expiry,
+            key_expiry=state.key_expiry,
+            device_expiry=state.device_expiry,
         )
 
-        return self._access_token  # type: ignore[return-value]
+        return state.access_token  # type: ignore[return-value]
 
     def get_authorization_header(self) -> str:
         """Return the Authorization header value. Raises if no token cached."""
-        if not self._access_token:
+        if not self._state.access_token:
             raise AuthenticationError("No PRODA token available — call get_token() first")
-        return f"Bearer {self._access_token}"
+        return f"Bearer {self._state.access_token}"
 
     def clear_token(self) -> None:
         """Clear the cached token (e.g., after 401 from AIR API)."""
-        self._access_token = None
-        self._token_expires_at = 0.0
+        self._state.access_token = None
+        self._state.token_expires_at = 0.0
 
 
 # Singleton instance
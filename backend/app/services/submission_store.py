@@ -11,17 +11,50 @@ Storage layout:
 
 from __future__ import annotations
 
-import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
+from uuid import uuid4
 
+import orjson
 import structlog
 
+from app.config import settings
+
 logger = structlog.get_logger(__name__)
 
 _DEFAULT_BASE = Path(__file__).resolve().parent.parent.parent / "data" / "submissions"
 
+# Same output shape as json.dumps(..., default=str, indent=2): int keys become
+# strings and datetimes go through str() rather than orjson's RFC 3339 form.
+_DUMPS_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _dumps(data: dict[str, Any]) -> bytes:
+    return orjson.dumps(data, default=str, option=_DUMPS_OPTIONS)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace path with data so readers never see a partially written file.
+
+    fsync is opt-in (AIR_DURABLE): the rename alone already protects against
+    torn files, and syncing every progress update dominates submission time.
+    """
+    # Unique per write: concurrent saves of one submission (progress updates
+    # racing the final save) must not share a temp file
+    tmp = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+    try:
+        with open(tmp, "xb") as f:
+            f.write(data)
+            if settings.AIR_DURABLE:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
 
 class SubmissionStore:
     """Read/write submission data as JSON files on disk."""
@@ -38,30 +71,33 @@ class SubmissionStore:
         """Write (or overwrite) metadata.json for a submission."""
         sub_dir = self._base / submission_id
         sub_dir.mkdir(parents=True, exist_ok=True)
-        path = sub_dir / "metadata.json"
-        path.write_text(json.dumps(data, default=str, indent=2), encoding="utf-8")
+        _atomic_write_bytes(sub_dir / "metadata.json", _dumps(data))
 
     def load_metadata(self, submission_id: str) -> dict[str, Any] | None:
         """Load metadata.json for a single submission, or None if missing."""
         path = self._base / submission_id / "metadata.json"
-        if not path.exists():
-            return None
         try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError) as exc:
+            return orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (orjson.JSONDecodeError, OSError) as exc:
             logger.warning("metadata_load_failed", submission_id=submission_id, error=str(exc))
             return None
 
     def load_all_metadata(self) -> dict[str, dict[str, Any]]:
         """Scan every sub-directory and return {submission_id: metadata}."""
         result: dict[str, dict[str, Any]] = {}
-        if not self._base.exists():
+        try:
+            # scandir reports the entry type from the directory listing, so
+            # there is no per-entry stat before reading each metadata.json
+            with os.scandir(self._base) as it:
+                names = sorted(entry.name for entry in it if entry.is_dir())
+        except FileNotFoundError:
             return result
-        for child in sorted(self._base.iterdir()):
-            if child.is_dir():
-                meta = self.load_metadata(child.name)
-                if meta is not None:
-                    result[child.name] = meta
+        for name in names:
+            meta = self.load_metadata(name)
+            if meta is not None:
+                result[name] = meta
         return result
 
     # ------------------------------------------------------------------
@@ -82,15 +118,13 @@ class SubmissionStore:
 
         ts = datetime.now(timezone.utc).isoformat()
 
-        req_path = payloads_dir / f"{prefix}_request.json"
-        req_path.write_text(
-            json.dumps({**request_body, "_timestamp": ts}, default=str, indent=2),
-            encoding="utf-8",
+        _atomic_write_bytes(
+            payloads_dir / f"{prefix}_request.json",
+            _dumps({**request_body, "_timestamp": ts}),
         )
 
         if response_body is not None:
-            resp_path = payloads_dir / f"{prefix}_response.json"
-            resp_path.write_text(
-                json.dumps({**response_body, "_timestamp": ts}, default=str, indent=2),
-                encoding="utf-8",
+            _atomic_write_bytes(
+                payloads_dir / f"{prefix}_response.json",
+                _dumps({**response_body, "_timestamp": ts}),
             )
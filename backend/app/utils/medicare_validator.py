@@ -3,7 +3,10 @@
 Implements the Medicare check digit algorithm per TECH.SIS.AIR.01 Appendix A.
 """
 
-import re
+# Weights 1, 3, 7, 9, 1, 3, 7, 9 applied to digits 1-8. The sum below works
+# on raw ASCII codes, so it carries an offset of ord("0") * sum(weights).
+_ASCII_ZERO = 48
+_WEIGHTED_ZERO_OFFSET = _ASCII_ZERO * 40
 
 
 def validate_medicare_check_digit(number: str) -> bool:
@@ -18,20 +21,17 @@ def validate_medicare_check_digit(number: str) -> bool:
     Returns:
         True if the check digit is valid and issue number is not 0.
     """
-    if not re.match(r"^\d{10}$", number):
+    if len(number) != 10 or not number.isascii() or not number.isdigit():
         return False
 
-    weights = [1, 3, 7, 9, 1, 3, 7, 9]
-    digits = [int(d) for d in number[:8]]
-
-    weighted_sum = sum(d * w for d, w in zip(digits, weights))
-    check_digit = weighted_sum % 10
-
-    if check_digit != int(number[8]):
+    b = number.encode("ascii")
+    weighted_sum = (
+        b[0] + 3 * b[1] + 7 * b[2] + 9 * b[3]
+        + b[4] + 3 * b[5] + 7 * b[6] + 9 * b[7]
+        - _WEIGHTED_ZERO_OFFSET
+    )
+    if weighted_sum % 10 != b[8] - _ASCII_ZERO:
         return False
 
     # Issue number (digit 10) must not be 0
-    if number[9] == "0":
-        return False
-
-    return True
+    return b[9] != _ASCII_ZERO
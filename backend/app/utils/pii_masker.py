@@ -5,6 +5,11 @@ before logging to prevent PII exposure.
 """
 
 import re
+from typing import Callable
+
+# Compiled once at import; mask_log_message runs on every masked log line
+_MEDICARE_RE = re.compile(r"\b\d{10}\b")
+_IHI_RE = re.compile(r"\b\d{16}\b")
 
 
 def mask_medicare(value: str) -> str:
@@ -40,28 +45,29 @@ def mask_dob(value: str) -> str:
     return "***"
 
 
+# Field name -> masker applied by mask_record (falsy values are left as-is)
+_PII_MASKERS: dict[str, Callable[[str], str]] = {
+    "medicareCardNumber": mask_medicare,
+    "medicareIRN": lambda _value: "*",
+    "ihiNumber": mask_ihi,
+    "firstName": mask_name,
+    "lastName": mask_name,
+    "dateOfBirth": mask_dob,
+}
+
+
 def mask_record(record: dict) -> dict:
     """Return a copy of a record dict with PII fields masked."""
-    masked = dict(record)
-    if "medicareCardNumber" in masked and masked["medicareCardNumber"]:
-        masked["medicareCardNumber"] = mask_medicare(str(masked["medicareCardNumber"]))
-    if "medicareIRN" in masked and masked["medicareIRN"]:
-        masked["medicareIRN"] = "*"
-    if "ihiNumber" in masked and masked["ihiNumber"]:
-        masked["ihiNumber"] = mask_ihi(str(masked["ihiNumber"]))
-    if "firstName" in masked and masked["firstName"]:
-        masked["firstName"] = mask_name(str(masked["firstName"]))
-    if "lastName" in masked and masked["lastName"]:
-        masked["lastName"] = mask_name(str(masked["lastName"]))
-    if "dateOfBirth" in masked and masked["dateOfBirth"]:
-        masked["dateOfBirth"] = mask_dob(str(masked["dateOfBirth"]))
-    return masked
+    return {
+        key: _PII_MASKERS[key](str(value)) if value and key in _PII_MASKERS else value
+        for key, value in record.items()
+    }
 
 
 def mask_log_message(message: str) -> str:
     """Mask potential PII patterns in a log message string."""
     # Mask 10-digit Medicare numbers
-    message = re.sub(r"\b\d{10}\b", lambda m: mask_medicare(m.group()), message)
+    message = _MEDICARE_RE.sub(lambda m: mask_medicare(m.group()), message)
     # Mask 16-digit IHI numbers
-    message = re.sub(r"\b\d{16}\b", lambda m: mask_ihi(m.group()), message)
+    message = _IHI_RE.sub(lambda m: mask_ihi(m.group()), message)
     return message
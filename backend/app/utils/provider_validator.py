@@ -6,8 +6,15 @@ details are not fully documented and official Services Australia test
 numbers must pass local validation.
 """
 
-# Valid state codes for AIR Provider Numbers
-_VALID_STATE_CODES = {"V", "N", "Q", "W", "S", "T", "A", "X"}
+import re
+
+# Shapes are matched after upper() and strip().
+# Medicare: 6-digit stem, then either nothing, any one character, or an
+# alphanumeric PLC followed by an alpha check character.
+_MEDICARE_PROVIDER_RE = re.compile(r"[0-9]{6}(?:.|[A-Z0-9][A-Z])?", re.DOTALL)
+# AIR: state code (V, N, Q, W, S, T, A, X), 5 digits, alpha check digit,
+# optional trailing character.
+_AIR_PROVIDER_RE = re.compile(r"[VNQWSTAX][0-9]{5}[A-Z].?", re.DOTALL)
 
 
 def validate_medicare_provider_number(number: str) -> bool:
@@ -24,22 +31,7 @@ def validate_medicare_provider_number(number: str) -> bool:
     Returns:
         True if the format is valid.
     """
-    number = number.upper().strip()
-    if len(number) < 6 or len(number) > 8:
-        return False
-
-    # First 6 chars must be digits
-    if not number[:6].isdigit():
-        return False
-
-    # If 8 chars: 7th must be alphanumeric, 8th must be alpha
-    if len(number) == 8:
-        if not number[6].isalnum():
-            return False
-        if not number[7].isalpha():
-            return False
-
-    return True
+    return _MEDICARE_PROVIDER_RE.fullmatch(number.upper().strip()) is not None
 
 
 def validate_air_provider_number(number: str) -> bool:
@@ -54,23 +46,7 @@ def validate_air_provider_number(number: str) -> bool:
     Returns:
         True if the format is valid.
     """
-    number = number.upper().strip()
-    if len(number) < 7 or len(number) > 8:
-        return False
-
-    state = number[0]
-    if state not in _VALID_STATE_CODES:
-        return False
-
-    # Chars 2-6 must be digits
-    if not number[1:6].isdigit():
-        return False
-
-    # Check digit position must be alpha
-    if not number[6].isalpha():
-        return False
-
-    return True
+    return _AIR_PROVIDER_RE.fullmatch(number.upper().strip()) is not None
 
 
 def validate_provider_number(number: str) -> bool:
@@ -10,6 +10,7 @@ from app.services.air_client import (
     BatchSubmissionService,
     ConfirmationService,
 )
+from app.services.proda_auth import ProdaAuthService
 
 
 @pytest.fixture
@@ -200,6 +201,76 @@ class TestConfirmationService:
         assert payload["claimSequenceNumber"] == "1"
 
 
+# ============================================================================
+# Expired Token Tests
+# ============================================================================
+
+def _mock_air_post(*status_codes: int) -> tuple[MagicMock, AsyncMock]:
+    """Patch httpx.AsyncClient so successive posts return the given statuses."""
+    responses = []
+    for code in status_codes:
+        response = MagicMock()
+        response.status_code = code
+        response.text = ""
+        response.json.return_value = {"statusCode": "AIR-I-1007", "message": "OK"}
+        responses.append(response)
+
+    mock_client = AsyncMock()
+    mock_client.post.side_effect = responses
+    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+    mock_client.__aexit__ = AsyncMock(return_value=False)
+    MockClient = MagicMock(return_value=mock_client)
+    return MockClient, mock_client
+
+
+class TestExpiredToken:
+    """Test that an AIR 401 drops the shared PRODA token and re-fetches it."""
+
+    @pytest.mark.anyio
+    async def test_401_refetches_token_and_retries(self) -> None:
+        proda = MagicMock(spec=ProdaAuthService)
+        proda.get_token = AsyncMock(return_value="fresh-token")
+        client = AIRClient(access_token="stale-token", proda=proda)
+        MockClient, mock_client = _mock_air_post(401, 200)
+
+        with patch("app.services.air_client.httpx.AsyncClient", MockClient):
+            result = await client.record_encounter(_sample_payload(), "1990-01-15")
+
+        assert result["status"] == "success"
+        proda.clear_token.assert_called_once()
+        proda.get_token.assert_awaited_once()
+        auth_headers = [
+            call.kwargs["headers"]["Authorization"] for call in mock_client.post.call_args_list
+        ]
+        assert auth_headers == ["Bearer stale-token", "Bearer fresh-token"]
+
+    @pytest.mark.anyio
+    async def test_second_401_is_raised(self) -> None:
+        proda = MagicMock(spec=ProdaAuthService)
+        proda.get_token = AsyncMock(return_value="fresh-token")
+        client = AIRClient(access_token="stale-token", proda=proda)
+        MockClient, mock_client = _mock_air_post(401, 401)
+
+        with patch("app.services.air_client.httpx.AsyncClient", MockClient):
+            with pytest.raises(AIRApiError) as exc_info:
+                await client.record_encounter(_sample_payload(), "1990-01-15")
+
+        assert exc_info.value.status_code == 401
+        assert mock_client.post.await_count == 2
+        proda.get_token.assert_awaited_once()
+
+    @pytest.mark.anyio
+    async def test_401_without_proda_is_raised(self, client: AIRClient) -> None:
+        MockClient, mock_client = _mock_air_post(401)
+
+        with patch("app.services.air_client.httpx.AsyncClient", MockClient):
+            with pytest.raises(AIRApiError) as exc_info:
+                await client.record_encounter(_sample_payload(), "1990-01-15")
+
+        assert exc_info.value.status_code == 401
+        assert mock_client.post.await_count == 1
+
+
 # ============================================================================
 # Batch Submission Tests
 # ============================================================================
@@ -14,7 +14,7 @@ import openpyxl
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from app.main import app
+from app.main import app, create_app
 
 
 def _make_xlsx_bytes() -> bytes:
@@ -196,3 +196,11 @@ async def test_custom_correlation_id_echoed(client: AsyncClient):
 async def test_404_for_unknown_route(client: AsyncClient):
     response = await client.get("/nonexistent")
     assert response.status_code == 404
+
+
+# --- App factory ---
+
+
+def test_create_app_without_middleware():
+    assert create_app(with_middleware=False).user_middleware == []
+    assert len(create_app().user_middleware) == 4
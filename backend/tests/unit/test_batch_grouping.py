@@ -1,5 +1,8 @@
 """Tests for batch grouping service."""
 
+from itertools import chain
+from operator import itemgetter
+
 import pytest
 
 from app.services.batch_grouping import (
@@ -9,9 +12,12 @@ from app.services.batch_grouping import (
     _individual_key,
 )
 
+_EXPECTED_ROWS_50 = frozenset(range(2, 52))
+
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def service() -> BatchGroupingService:
+    # BatchGroupingService holds no per-call state, so one instance is shared.
     return BatchGroupingService()
 
 
@@ -80,6 +86,20 @@ class TestIndividualKey:
         assert _individual_key(r1) != _individual_key(r2)
 
 
+class TestStateless:
+    """The shared service fixture relies on group() keeping no state."""
+
+    def test_service_has_no_instance_state(self, service: BatchGroupingService) -> None:
+        service.group([_make_record()])
+        assert vars(service) == {}
+
+    def test_repeated_calls_are_independent(self, service: BatchGroupingService) -> None:
+        records = [_make_record(row=2), _make_record(row=3, dos="2026-03-01")]
+        first = service.group(records)
+        service.group([_make_record(row=9, medicare="9876543210")])
+        assert service.group(records) == first
+
+
 class TestSingleRecord:
     """Test grouping a single record."""
 
@@ -172,7 +192,7 @@ class TestDifferentIndividuals:
             _make_record(row=3, medicare="9876543210"),
         ]
         batches = service.group(records)
-        total_encounters = sum(b["encounterCount"] for b in batches)
+        total_encounters = sum(map(itemgetter("encounterCount"), batches))
         assert total_encounters == 2
 
 
@@ -186,7 +206,7 @@ class TestEpisodeLimitEnforced:
         ]
         batches = service.group(records)
         # Should split into 2 encounters (5 + 1)
-        total_encounters = sum(b["encounterCount"] for b in batches)
+        total_encounters = sum(map(itemgetter("encounterCount"), batches))
         assert total_encounters == 2
 
     def test_first_encounter_has_5_episodes(self, service: BatchGroupingService) -> None:
@@ -245,7 +265,7 @@ class TestLargeDataset:
             for i in range(2, 52)
         ]
         batches = service.group(records)
-        total_encounters = sum(b["encounterCount"] for b in batches)
+        total_encounters = sum(map(itemgetter("encounterCount"), batches))
         assert total_encounters == 10  # 50 / 5 = 10
 
     def test_50_records_preserves_all_row_numbers(self, service: BatchGroupingService) -> None:
@@ -254,82 +274,97 @@ class TestLargeDataset:
             for i in range(2, 52)
         ]
         batches = service.group(records)
-        all_rows = []
-        for batch in batches:
-            all_rows.extend(batch["sourceRows"])
-        assert sorted(all_rows) == list(range(2, 52))
+        all_rows = list(chain.from_iterable(map(itemgetter("sourceRows"), batches)))
+        assert len(all_rows) == 50
+        assert set(all_rows) == _EXPECTED_ROWS_50
+
+
+@pytest.fixture(scope="module")
+def all_fields_batches(service: BatchGroupingService) -> list[dict]:
+    """One group() call over a record carrying every optional field."""
+    record = _make_record(
+        medicare="2123456789",
+        irn="1",
+        dob="1990-01-15",
+        gender="F",
+        provider="1234567A",
+        vaccine_code="COMIRN",
+        postCode="2000",
+        ihiNumber="8003608833357361",
+        administeredOverseas=True,
+        countryCode="USA",
+        antenatalIndicator=True,
+        schoolId="123456789",
+        vaccineBatch="FL1234",
+        vaccineType="NIP",
+        routeOfAdministration="IM",
+    )
+    return service.group([record])
+
+
+def _walk(obj, dotted: str):
+    """Follow a dotted path of dict keys / list indexes into grouped output."""
+    for part in dotted.split("."):
+        obj = obj[int(part)] if isinstance(obj, list) else obj[part]
+    return obj
+
+
+def _assert_field(obj, dotted: str, expected) -> None:
+    """Assert the value at dotted equals expected with the exact same type (True != 1)."""
+    actual = _walk(obj, dotted)
+    assert type(actual) is type(expected)
+    assert actual == expected
 
 
 class TestIndividualExtraction:
     """Test that individual fields are correctly extracted."""
 
-    def test_medicare_card_included(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(medicare="2123456789", irn="1")])
-        ind = batches[0]["encounters"][0]["individual"]
-        assert ind["medicareCard"]["medicareCardNumber"] == "2123456789"
-        assert ind["medicareCard"]["medicareIRN"] == "1"
-
-    def test_ihi_included(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(ihiNumber="8003608833357361")])
-        ind = batches[0]["encounters"][0]["individual"]
-        assert ind["ihiNumber"] == "8003608833357361"
-
-    def test_personal_details(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(dob="1990-01-15", gender="F")])
-        pd = batches[0]["encounters"][0]["individual"]["personalDetails"]
-        assert pd["dateOfBirth"] == "1990-01-15"
-        assert pd["gender"] == "F"
-
-    def test_postcode_included(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(postCode="2000")])
-        ind = batches[0]["encounters"][0]["individual"]
-        assert ind["address"]["postCode"] == "2000"
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("medicareCard.medicareCardNumber", "2123456789"),
+            ("medicareCard.medicareIRN", "1"),
+            ("ihiNumber", "8003608833357361"),
+            ("personalDetails.dateOfBirth", "1990-01-15"),
+            ("personalDetails.gender", "F"),
+            ("address.postCode", "2000"),
+        ],
+    )
+    def test_individual_field(self, all_fields_batches: list[dict], path: str, expected) -> None:
+        ind = all_fields_batches[0]["encounters"][0]["individual"]
+        _assert_field(ind, path, expected)
 
 
 class TestEncounterFields:
     """Test encounter-level field extraction."""
 
-    def test_provider_number(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(provider="1234567A")])
-        enc = batches[0]["encounters"][0]
-        assert enc["immunisationProvider"]["providerNumber"] == "1234567A"
-
-    def test_administered_overseas(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(administeredOverseas=True, countryCode="USA")])
-        enc = batches[0]["encounters"][0]
-        assert enc["administeredOverseas"] is True
-        assert enc["countryCode"] == "USA"
-
-    def test_antenatal_indicator(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(antenatalIndicator=True)])
-        enc = batches[0]["encounters"][0]
-        assert enc["antenatalIndicator"] is True
-
-    def test_school_id(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(schoolId="123456789")])
-        enc = batches[0]["encounters"][0]
-        assert enc["schoolId"] == "123456789"
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("immunisationProvider.providerNumber", "1234567A"),
+            ("administeredOverseas", True),
+            ("countryCode", "USA"),
+            ("antenatalIndicator", True),
+            ("schoolId", "123456789"),
+        ],
+    )
+    def test_encounter_field(self, all_fields_batches: list[dict], path: str, expected) -> None:
+        enc = all_fields_batches[0]["encounters"][0]
+        _assert_field(enc, path, expected)
 
 
 class TestEpisodeFields:
     """Test episode field extraction."""
 
-    def test_vaccine_code(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(vaccine_code="COMIRN")])
-        ep = batches[0]["encounters"][0]["episodes"][0]
-        assert ep["vaccineCode"] == "COMIRN"
-
-    def test_vaccine_batch(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(vaccineBatch="FL1234")])
-        ep = batches[0]["encounters"][0]["episodes"][0]
-        assert ep["vaccineBatch"] == "FL1234"
-
-    def test_vaccine_type(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(vaccineType="NIP")])
-        ep = batches[0]["encounters"][0]["episodes"][0]
-        assert ep["vaccineType"] == "NIP"
-
-    def test_route_of_administration(self, service: BatchGroupingService) -> None:
-        batches = service.group([_make_record(routeOfAdministration="IM")])
-        ep = batches[0]["encounters"][0]["episodes"][0]
-        assert ep["routeOfAdministration"] == "IM"
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("vaccineCode", "COMIRN"),
+            ("vaccineBatch", "FL1234"),
+            ("vaccineType", "NIP"),
+            ("routeOfAdministration", "IM"),
+        ],
+    )
+    def test_episode_field(self, all_fields_batches: list[dict], path: str, expected) -> None:
+        ep = all_fields_batches[0]["encounters"][0]["episodes"][0]
+        _assert_field(ep, path, expected)
@@ -4,15 +4,22 @@ Tests the bulk_history router endpoints: upload, validate, process, progress,
 results, and download.
 """
 
-import asyncio
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import MappingProxyType
 
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
-from app.routers.bulk_history import _requests
+from app.routers.bulk_history import _format_date_display, _requests
+from app.schemas.bulk_history import (
+    BulkHistoryProcessRequest,
+    BulkHistoryProcessResponse,
+    BulkHistoryValidateRequest,
+    BulkHistoryValidateResponse,
+    HistoryResultEntry,
+    IndividualHistoryResult,
+)
 
 client = TestClient(app)
 
@@ -21,47 +28,63 @@ client = TestClient(app)
 # Helper factories
 # ============================================================================
 
+_VALID_BASE = MappingProxyType({
+    "rowNumber": 2,
+    "medicareCardNumber": "2123456701",
+    "medicareIRN": "1",
+    "firstName": "John",
+    "lastName": "Smith",
+    "dateOfBirth": "1990-01-15",
+    "gender": "M",
+})
+
+_IHI_BASE = MappingProxyType({
+    "rowNumber": 3,
+    "ihiNumber": "8003608833357361",
+    "firstName": "Jane",
+    "lastName": "Doe",
+    "dateOfBirth": "1985-05-20",
+    "gender": "F",
+})
+
+_DEMOGRAPHICS_BASE = MappingProxyType({
+    "rowNumber": 4,
+    "firstName": "Alice",
+    "lastName": "Brown",
+    "dateOfBirth": "2000-03-10",
+    "gender": "X",
+    "postCode": "2000",
+})
+
+
 def _valid_record(**overrides) -> dict:
     """Create a valid patient record for bulk history."""
-    record = {
-        "rowNumber": 2,
-        "medicareCardNumber": "2123456701",
-        "medicareIRN": "1",
-        "firstName": "John",
-        "lastName": "Smith",
-        "dateOfBirth": "1990-01-15",
-        "gender": "M",
-    }
-    record.update(overrides)
-    return record
+    return {**_VALID_BASE, **overrides} if overrides else dict(_VALID_BASE)
 
 
 def _ihi_record(**overrides) -> dict:
     """Create a valid IHI-based record."""
-    record = {
-        "rowNumber": 3,
-        "ihiNumber": "8003608833357361",
-        "firstName": "Jane",
-        "lastName": "Doe",
-        "dateOfBirth": "1985-05-20",
-        "gender": "F",
-    }
-    record.update(overrides)
-    return record
+    return {**_IHI_BASE, **overrides} if overrides else dict(_IHI_BASE)
 
 
 def _demographics_record(**overrides) -> dict:
     """Create a valid demographics-based record."""
-    record = {
-        "rowNumber": 4,
-        "firstName": "Alice",
-        "lastName": "Brown",
-        "dateOfBirth": "2000-03-10",
-        "gender": "X",
-        "postCode": "2000",
-    }
-    record.update(overrides)
-    return record
+    return {**_DEMOGRAPHICS_BASE, **overrides} if overrides else dict(_DEMOGRAPHICS_BASE)
+
+
+# Pre-encoded body for the common single valid Medicare record request, so
+# tests posting the identical payload skip the per-call JSON encode.
+_VALID_MEDICARE_BODY = json.dumps({
+    "records": [_valid_record()],
+    "providerNumber": "2448141T",
+}).encode()
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _err_index(data: dict) -> tuple[set[str], set[str]]:
+    """Return the sets of error fields and error codes in a validate response."""
+    errors = data["errors"]
+    return {e["field"] for e in errors}, {e["errorCode"] for e in errors}
 
 
 # ============================================================================
@@ -72,10 +95,11 @@ class TestBulkHistoryValidate:
     """Tests for POST /api/bulk-history/validate."""
 
     def test_validate_valid_medicare_record(self):
-        resp = client.post("/api/bulk-history/validate", json={
-            "records": [_valid_record()],
-            "providerNumber": "2448141T",
-        })
+        resp = client.post(
+            "/api/bulk-history/validate",
+            content=_VALID_MEDICARE_BODY,
+            headers=_JSON_HEADERS,
+        )
         assert resp.status_code == 200
         data = resp.json()
         assert data["isValid"] is True
@@ -129,7 +153,8 @@ class TestBulkHistoryValidate:
         data = resp.json()
         assert data["isValid"] is False
         assert data["invalidRecords"] == 1
-        assert any(e["field"] == "dateOfBirth" for e in data["errors"])
+        fields, _ = _err_index(data)
+        assert "dateOfBirth" in fields
 
     def test_validate_invalid_gender(self):
         resp = client.post("/api/bulk-history/validate", json={
@@ -139,7 +164,8 @@ class TestBulkHistoryValidate:
         assert resp.status_code == 200
         data = resp.json()
         assert data["isValid"] is False
-        assert any(e["field"] == "gender" for e in data["errors"])
+        fields, _ = _err_index(data)
+        assert "gender" in fields
 
     def test_validate_missing_gender(self):
         record = _valid_record()
@@ -168,7 +194,8 @@ class TestBulkHistoryValidate:
         assert resp.status_code == 200
         data = resp.json()
         assert data["isValid"] is False
-        assert any(e["errorCode"] == "AIR-E-1026" for e in data["errors"])
+        _, codes = _err_index(data)
+        assert "AIR-E-1026" in codes
 
     def test_validate_invalid_medicare_check_digit(self):
         resp = client.post("/api/bulk-history/validate", json={
@@ -178,7 +205,8 @@ class TestBulkHistoryValidate:
         assert resp.status_code == 200
         data = resp.json()
         assert data["isValid"] is False
-        assert any(e["errorCode"] == "AIR-E-1017" for e in data["errors"])
+        _, codes = _err_index(data)
+        assert "AIR-E-1017" in codes
 
     def test_validate_invalid_ihi_format(self):
         resp = client.post("/api/bulk-history/validate", json={
@@ -188,7 +216,8 @@ class TestBulkHistoryValidate:
         assert resp.status_code == 200
         data = resp.json()
         assert data["isValid"] is False
-        assert any(e["field"] == "ihiNumber" for e in data["errors"])
+        fields, _ = _err_index(data)
+        assert "ihiNumber" in fields
 
     def test_validate_future_dob(self):
         resp = client.post("/api/bulk-history/validate", json={
@@ -198,30 +227,31 @@ class TestBulkHistoryValidate:
         assert resp.status_code == 200
         data = resp.json()
         assert data["isValid"] is False
-        assert any(e["errorCode"] == "AIR-E-1018" for e in data["errors"])
-
-    def test_validate_empty_records(self):
-        resp = client.post("/api/bulk-history/validate", json={
-            "records": [],
-            "providerNumber": "2448141T",
-        })
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["isValid"] is True
-        assert data["totalRecords"] == 0
-
-    def test_validate_requires_provider_number(self):
-        resp = client.post("/api/bulk-history/validate", json={
-            "records": [_valid_record()],
-        })
-        assert resp.status_code == 422  # Missing required field
-
-    def test_validate_provider_number_too_short(self):
-        resp = client.post("/api/bulk-history/validate", json={
-            "records": [_valid_record()],
-            "providerNumber": "AB",
-        })
-        assert resp.status_code == 422
+        _, codes = _err_index(data)
+        assert "AIR-E-1018" in codes
+
+    @pytest.mark.parametrize(
+        "payload, expected_status",
+        [
+            ({"records": [], "providerNumber": "2448141T"}, 200),
+            ({"records": [_valid_record()]}, 422),  # Missing required field
+            ({"records": [_valid_record()], "providerNumber": "AB"}, 422),
+            ({"records": [{"gender": "M"}], "providerNumber": "2448141T"}, 422),
+        ],
+        ids=[
+            "empty_records",
+            "requires_provider_number",
+            "provider_number_too_short",
+            "requires_row_number",
+        ],
+    )
+    def test_validate_edge_cases(self, payload, expected_status):
+        resp = client.post("/api/bulk-history/validate", json=payload)
+        assert resp.status_code == expected_status
+        if expected_status == 200:
+            data = resp.json()
+            assert data["isValid"] is True
+            assert data["totalRecords"] == 0
 
     def test_validate_gender_x_valid(self):
         """Gender X (indeterminate) must be accepted."""
@@ -234,16 +264,45 @@ class TestBulkHistoryValidate:
         assert data["isValid"] is True
 
     def test_validate_returns_records_in_response(self):
-        records = [_valid_record()]
-        resp = client.post("/api/bulk-history/validate", json={
-            "records": records,
-            "providerNumber": "2448141T",
-        })
+        resp = client.post(
+            "/api/bulk-history/validate",
+            content=_VALID_MEDICARE_BODY,
+            headers=_JSON_HEADERS,
+        )
         assert resp.status_code == 200
         data = resp.json()
         assert len(data["records"]) == 1
         assert data["records"][0]["rowNumber"] == 2
 
+    def test_validate_response_body_matches_schema(self):
+        resp = client.post(
+            "/api/bulk-history/validate",
+            content=_VALID_MEDICARE_BODY,
+            headers=_JSON_HEADERS,
+        )
+        assert resp.json() == {
+            "isValid": True,
+            "totalRecords": 1,
+            "validRecords": 1,
+            "invalidRecords": 0,
+            "errors": [],
+            "records": [_valid_record()],
+        }
+        BulkHistoryValidateResponse.model_validate_json(resp.content)
+
+    def test_validate_response_schema_documented(self):
+        responses = app.openapi()["paths"]["/api/bulk-history/validate"]["post"]["responses"]
+        schema = responses["200"]["content"]["application/json"]["schema"]
+        assert schema == {"$ref": "#/components/schemas/BulkHistoryValidateResponse"}
+
+    def test_validate_echoes_ints_wider_than_64_bits(self):
+        resp = client.post("/api/bulk-history/validate", json={
+            "providerNumber": "1234567A",
+            "records": [{"rowNumber": 2, "notes": 12345678901234567890123}],
+        })
+        assert resp.status_code == 200
+        assert resp.json()["records"] == [{"rowNumber": 2, "notes": 12345678901234567890123}]
+
 
 # ============================================================================
 # Process endpoint
@@ -253,10 +312,11 @@ class TestBulkHistoryProcess:
     """Tests for POST /api/bulk-history/process."""
 
     def test_process_returns_request_id(self):
-        resp = client.post("/api/bulk-history/process", json={
-            "records": [_valid_record()],
-            "providerNumber": "2448141T",
-        })
+        resp = client.post(
+            "/api/bulk-history/process",
+            content=_VALID_MEDICARE_BODY,
+            headers=_JSON_HEADERS,
+        )
         assert resp.status_code == 200
         data = resp.json()
         assert data["requestId"]
@@ -295,10 +355,11 @@ class TestBulkHistoryProgress:
 
     def test_progress_returns_initial_state(self):
         # Start a process
-        process_resp = client.post("/api/bulk-history/process", json={
-            "records": [_valid_record()],
-            "providerNumber": "2448141T",
-        })
+        process_resp = client.post(
+            "/api/bulk-history/process",
+            content=_VALID_MEDICARE_BODY,
+            headers=_JSON_HEADERS,
+        )
         request_id = process_resp.json()["requestId"]
 
         # Check progress immediately
@@ -464,13 +525,14 @@ class TestBulkHistoryDownload:
             ],
         }
 
-        resp = client.get("/api/bulk-history/test-download-id/download")
-        assert resp.status_code == 200
-        assert "spreadsheet" in resp.headers["content-type"]
-        assert "immunisation-history" in resp.headers["content-disposition"]
-        assert ".xlsx" in resp.headers["content-disposition"]
-        # Verify it's a valid xlsx (starts with PK zip header)
-        assert resp.content[:2] == b"PK"
+        with client.stream("GET", "/api/bulk-history/test-download-id/download") as resp:
+            assert resp.status_code == 200
+            assert "spreadsheet" in resp.headers["content-type"]
+            assert "immunisation-history" in resp.headers["content-disposition"]
+            assert ".xlsx" in resp.headers["content-disposition"]
+            # Verify it's a valid xlsx (starts with PK zip header) without
+            # reading the rest of the body
+            assert next(resp.iter_bytes(2)) == b"PK"
 
         del _requests["test-download-id"]
 
@@ -483,25 +545,28 @@ class TestDateFormatting:
     """Tests for _format_date_display helper."""
 
     def test_ddMMyyyy_to_display(self):
-        from app.routers.bulk_history import _format_date_display
         assert _format_date_display("01022025") == "01/02/2025"
 
     def test_yyyy_mm_dd_to_display(self):
-        from app.routers.bulk_history import _format_date_display
         assert _format_date_display("2025-02-01") == "01/02/2025"
 
     def test_empty_string(self):
-        from app.routers.bulk_history import _format_date_display
         assert _format_date_display("") == ""
 
     def test_none_input(self):
-        from app.routers.bulk_history import _format_date_display
         assert _format_date_display(None) == ""
 
+    def test_dd_mm_yyyy_dashed_parts_reversed(self):
+        assert _format_date_display("01-02-2025") == "2025/02/01"
+
     def test_unknown_format_passthrough(self):
-        from app.routers.bulk_history import _format_date_display
         assert _format_date_display("2025/02/01") == "2025/02/01"
 
+    def test_repeated_input_formats_consistently(self):
+        assert [_format_date_display(d) for d in ("15032024", "2024-03-15", "15032024")] == [
+            "15/03/2024", "15/03/2024", "15/03/2024",
+        ]
+
 
 # ============================================================================
 # Schema validation
@@ -511,7 +576,6 @@ class TestBulkHistorySchemas:
     """Tests for Pydantic schema validation."""
 
     def test_validate_request_schema(self):
-        from app.schemas.bulk_history import BulkHistoryValidateRequest
         req = BulkHistoryValidateRequest(
             records=[{"rowNumber": 1, "dateOfBirth": "1990-01-15", "gender": "M"}],
             providerNumber="2448141T",
@@ -519,8 +583,14 @@ class TestBulkHistorySchemas:
         assert req.providerNumber == "2448141T"
         assert len(req.records) == 1
 
+    def test_validate_request_requires_row_number(self):
+        with pytest.raises(ValueError, match="rowNumber"):
+            BulkHistoryValidateRequest(
+                records=[{"dateOfBirth": "1990-01-15", "gender": "M"}],
+                providerNumber="2448141T",
+            )
+
     def test_process_request_schema(self):
-        from app.schemas.bulk_history import BulkHistoryProcessRequest
         req = BulkHistoryProcessRequest(
             records=[{"rowNumber": 1}],
             providerNumber="2448141T",
@@ -528,7 +598,6 @@ class TestBulkHistorySchemas:
         assert req.providerNumber == "2448141T"
 
     def test_process_response_schema(self):
-        from app.schemas.bulk_history import BulkHistoryProcessResponse
         resp = BulkHistoryProcessResponse(
             requestId="abc-123",
             status="running",
@@ -537,22 +606,20 @@ class TestBulkHistorySchemas:
         assert resp.requestId == "abc-123"
 
     def test_history_result_entry(self):
-        from app.schemas.bulk_history import HistoryResultEntry
         entry = HistoryResultEntry(
             dateOfService="01022025",
             vaccineCode="COMIRN",
             vaccineDose="1",
             status="VALID",
         )
-        assert entry.vaccineCode == "COMIRN"
+        assert entry["vaccineCode"] == "COMIRN"
 
     def test_individual_history_result(self):
-        from app.schemas.bulk_history import IndividualHistoryResult
         result = IndividualHistoryResult(
             rowNumber=1,
             status="success",
             immunisationHistory=[],
             vaccineDueDetails=[],
         )
-        assert result.status == "success"
-        assert result.immunisationHistory == []
+        assert result["status"] == "success"
+        assert result["immunisationHistory"] == []
@@ -9,17 +9,26 @@ from app.config import Settings, mask_secret
 
 
 class TestMaskSecret:
-    def test_masks_long_secret(self):
-        assert mask_secret("mysupersecretkey") == "mysu****"
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("mysupersecretkey", "mysu****"),
+            ("abc", "****"),
+            ("abcd", "****"),
+            ("abcde", "abcd****"),
+        ],
+    )
+    def test_mask_secret(self, value, expected):
+        assert mask_secret(value) == expected
 
-    def test_masks_short_secret(self):
-        assert mask_secret("abc") == "****"
 
-    def test_masks_exact_four_chars(self):
-        assert mask_secret("abcd") == "****"
+@pytest.fixture(scope="module")
+def default_settings() -> Settings:
+    """Settings built once with no overrides, for read-only default checks.
 
-    def test_masks_five_chars(self):
-        assert mask_secret("abcde") == "abcd****"
+    Module-scoped only: tests that need a distinct environment build their own.
+    """
+    return Settings(_env_file=None)
 
 
 class TestSettings:
@@ -70,32 +79,19 @@ class TestSettings:
                 _env_file=None,
             )
 
-    def test_default_product_id(self):
-        s = Settings(_env_file=None)
-        assert s.AIR_PRODUCT_ID == "EM Bulk Vaccination Upload V1.2"
-
-    def test_default_proda_jwt_audience(self):
-        s = Settings(_env_file=None)
-        assert s.PRODA_JWT_AUDIENCE == "https://proda.humanservices.gov.au"
-
-    def test_default_proda_client_id(self):
-        s = Settings(_env_file=None)
-        assert s.PRODA_CLIENT_ID == "soape-testing-client-v2"
-
-    def test_default_proda_key_alias(self):
-        s = Settings(_env_file=None)
-        assert s.PRODA_KEY_ALIAS == "proda-alias"
-
-    def test_default_proda_jks_password(self):
-        s = Settings(_env_file=None)
-        assert s.PRODA_JKS_PASSWORD == "Pass-123"
-
-    def test_jwt_defaults(self):
-        s = Settings(_env_file=None)
-        assert s.JWT_ALGORITHM == "HS256"
-        assert s.JWT_ACCESS_TOKEN_EXPIRE_MINUTES == 30
-        assert s.JWT_MAX_SESSION_HOURS == 8
-
-    def test_log_format_default(self):
-        s = Settings(_env_file=None)
-        assert s.LOG_FORMAT == "json"
+    @pytest.mark.parametrize(
+        "attr, expected",
+        [
+            ("AIR_PRODUCT_ID", "EM Bulk Vaccination Upload V1.2"),
+            ("PRODA_JWT_AUDIENCE", "https://proda.humanservices.gov.au"),
+            ("PRODA_CLIENT_ID", "soape-testing-client-v2"),
+            ("PRODA_KEY_ALIAS", "proda-alias"),
+            ("PRODA_JKS_PASSWORD", "Pass-123"),
+            ("JWT_ALGORITHM", "HS256"),
+            ("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", 30),
+            ("JWT_MAX_SESSION_HOURS", 8),
+            ("LOG_FORMAT", "json"),
+        ],
+    )
+    def test_defaults(self, default_settings, attr, expected):
+        assert getattr(default_settings, attr) == expected
@@ -2,14 +2,24 @@
 
 import io
 from datetime import datetime
+from typing import Any
+from zipfile import ZIP_STORED, ZipFile
 
 import pytest
 from openpyxl import Workbook
+from openpyxl.writer.excel import ExcelWriter
 
 from app.middleware.error_handler import FileProcessingError
 from app.services.excel_parser import ExcelParserService
 
 
+def _save_uncompressed(wb: Workbook) -> bytes:
+    """Serialize a workbook without DEFLATE; the parser reads stored zips too."""
+    buf = io.BytesIO()
+    ExcelWriter(wb, ZipFile(buf, "w", ZIP_STORED)).save()
+    return buf.getvalue()
+
+
 def _make_excel(headers: list[str], rows: list[list]) -> bytes:
     """Create an in-memory Excel file with given headers and rows."""
     wb = Workbook()
@@ -17,17 +27,15 @@ def _make_excel(headers: list[str], rows: list[list]) -> bytes:
     ws.append(headers)
     for row in rows:
         ws.append(row)
-    buf = io.BytesIO()
-    wb.save(buf)
-    return buf.getvalue()
+    return _save_uncompressed(wb)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def parser():
     return ExcelParserService()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def valid_excel() -> bytes:
     return _make_excel(
         [
@@ -51,16 +59,22 @@ def valid_excel() -> bytes:
     )
 
 
+@pytest.fixture(scope="module")
+def valid_result(parser, valid_excel) -> dict:
+    """Parse result for valid_excel, shared by the read-only tests below."""
+    return parser.parse(valid_excel)
+
+
 class TestParseValidFile:
-    def test_parses_single_record(self, parser, valid_excel):
-        result = parser.parse(valid_excel)
+    def test_parses_single_record(self, valid_result):
+        result = valid_result
         assert result["totalRows"] == 1
         assert result["validRecords"] == 1
         assert len(result["records"]) == 1
         assert len(result["errors"]) == 0
 
-    def test_record_has_expected_fields(self, parser, valid_excel):
-        rec = parser.parse(valid_excel)["records"][0]
+    def test_record_has_expected_fields(self, valid_result):
+        rec = valid_result["records"][0]
         assert rec["medicareCardNumber"] == "2123456789"
         assert rec["medicareIRN"] == "1"
         assert rec["firstName"] == "Jane"
@@ -77,76 +91,100 @@ class TestParseValidFile:
         assert rec["administeredOverseas"] is False
         assert rec["immunisingProviderNumber"] == "1234567A"
 
-    def test_row_number_is_2_for_first_data_row(self, parser, valid_excel):
-        rec = parser.parse(valid_excel)["records"][0]
+    def test_row_number_is_2_for_first_data_row(self, valid_result):
+        rec = valid_result["records"][0]
         assert rec["rowNumber"] == 2
 
 
-class TestDateParsing:
-    def test_datetime_object(self, parser):
-        excel = _make_excel(
-            ["Date of Birth", "Vaccine Code"],
-            [[datetime(2000, 6, 15), "FLU"]],
-        )
-        rec = parser.parse(excel)["records"][0]
-        assert rec["dateOfBirth"] == "2000-06-15"
+# Single-cell normalisation cases, all laid out as rows of one shared sheet
+# so the workbook is built and parsed once per module.
+_VALID_DATES = [
+    (datetime(2000, 6, 15), "2000-06-15"),
+    ("15/06/2000", "2000-06-15"),
+    ("5/6/2000", "2000-06-05"),
+    ("05-06-2000", "2000-06-05"),
+    ("2000-06-05", "2000-06-05"),
+]
+_INVALID_DATES = ["not-a-date", "31/02/2000"]
+_VALID_GENDERS = [
+    ("M", "M"), ("Male", "M"), ("male", "M"),
+    ("F", "F"), ("Female", "F"),
+    ("X", "X"), ("Not Stated", "X"),
+]
+_INVALID_GENDERS = ["Z", "I", "Intersex", "U", "Unknown"]
+
+_CELL_HEADERS = ["Date of Birth", "Gender", "Vaccine Code"]
+# One (header, value) case per row from row 2, with a blank row between the
+# date and gender cases
+_CELL_ROWS: list[tuple[str, Any] | None] = (
+    [("Date of Birth", v) for v, _ in _VALID_DATES]
+    + [("Date of Birth", v) for v in _INVALID_DATES]
+    + [None]
+    + [("Gender", v) for v, _ in _VALID_GENDERS]
+    + [("Gender", v) for v in _INVALID_GENDERS]
+)
+_ROW_OF = {case: i + 2 for i, case in enumerate(_CELL_ROWS) if case is not None}
+_BLANK_ROW_NUMBER = _CELL_ROWS.index(None) + 2
+
+
+@pytest.fixture(scope="module")
+def cell_sheet(parser) -> dict:
+    """Parse the shared case sheet once for the whole module."""
+    rows: list[list] = []
+    for case in _CELL_ROWS:
+        row = [None, None, None if case is None else "FLU"]
+        if case is not None:
+            header, value = case
+            row[_CELL_HEADERS.index(header)] = value
+        rows.append(row)
+    return parser.parse(_make_excel(_CELL_HEADERS, rows))
+
+
+def _parsed_cell(result: dict, header: str, value) -> tuple[dict | None, list[dict]]:
+    """Return the record (None if rejected) and errors for one case's row."""
+    row_number = _ROW_OF[(header, value)]
+    rec = next((r for r in result["records"] if r["rowNumber"] == row_number), None)
+    return rec, [e for e in result["errors"] if e["row"] == row_number]
 
-    def test_dd_mm_yyyy_string(self, parser):
-        excel = _make_excel(
-            ["Date of Birth", "Vaccine Code"],
-            [["15/06/2000", "FLU"]],
-        )
-        rec = parser.parse(excel)["records"][0]
-        assert rec["dateOfBirth"] == "2000-06-15"
 
-    def test_invalid_date_produces_error(self, parser):
-        excel = _make_excel(
-            ["Date of Birth", "Vaccine Code"],
-            [["not-a-date", "FLU"]],
-        )
-        result = parser.parse(excel)
-        assert len(result["errors"]) == 1
-        assert result["errors"][0]["field"] == "dateOfBirth"
+class TestDateParsing:
+    @pytest.mark.parametrize("input_val,expected", _VALID_DATES)
+    def test_valid_dates(self, cell_sheet, input_val, expected):
+        rec, errors = _parsed_cell(cell_sheet, "Date of Birth", input_val)
+        assert errors == []
+        assert rec["dateOfBirth"] == expected
+
+    @pytest.mark.parametrize("input_val", _INVALID_DATES)
+    def test_invalid_date_produces_error(self, cell_sheet, input_val):
+        rec, errors = _parsed_cell(cell_sheet, "Date of Birth", input_val)
+        assert rec is None
+        assert len(errors) == 1
+        assert errors[0]["field"] == "dateOfBirth"
+        assert "Invalid date format" in errors[0]["message"]
 
 
 class TestGenderNormalization:
-    @pytest.mark.parametrize("input_val,expected", [
-        ("M", "M"), ("Male", "M"), ("male", "M"),
-        ("F", "F"), ("Female", "F"),
-        ("X", "X"), ("Not Stated", "X"),
-    ])
-    def test_valid_genders(self, parser, input_val, expected):
-        excel = _make_excel(
-            ["Gender", "Vaccine Code"],
-            [[input_val, "FLU"]],
-        )
-        rec = parser.parse(excel)["records"][0]
+    @pytest.mark.parametrize("input_val,expected", _VALID_GENDERS)
+    def test_valid_genders(self, cell_sheet, input_val, expected):
+        rec, errors = _parsed_cell(cell_sheet, "Gender", input_val)
+        assert errors == []
         assert rec["gender"] == expected
 
-    @pytest.mark.parametrize("input_val", ["Z", "I", "Intersex", "U", "Unknown"])
-    def test_invalid_gender_produces_error(self, parser, input_val):
-        excel = _make_excel(
-            ["Gender", "Vaccine Code"],
-            [[input_val, "FLU"]],
-        )
-        result = parser.parse(excel)
-        assert len(result["errors"]) == 1
-        assert "Invalid gender" in result["errors"][0]["message"]
+    @pytest.mark.parametrize("input_val", _INVALID_GENDERS)
+    def test_invalid_gender_produces_error(self, cell_sheet, input_val):
+        rec, errors = _parsed_cell(cell_sheet, "Gender", input_val)
+        assert rec is None
+        assert len(errors) == 1
+        assert "Invalid gender" in errors[0]["message"]
 
 
 class TestEmptyRows:
-    def test_empty_rows_are_skipped(self, parser):
-        excel = _make_excel(
-            ["Vaccine Code", "First Name"],
-            [
-                ["FLU", "Jane"],
-                [None, None],  # empty row
-                ["COVID", "John"],
-            ],
-        )
-        result = parser.parse(excel)
-        assert result["validRecords"] == 2
-        assert result["totalRows"] == 3
+    def test_empty_rows_are_skipped(self, cell_sheet):
+        assert _BLANK_ROW_NUMBER not in {r["rowNumber"] for r in cell_sheet["records"]}
+        assert _BLANK_ROW_NUMBER not in {e["row"] for e in cell_sheet["errors"]}
+        # The blank row still counts towards totalRows
+        assert cell_sheet["totalRows"] == len(_CELL_ROWS)
+        assert cell_sheet["validRecords"] == len(_VALID_DATES) + len(_VALID_GENDERS)
 
 
 class TestInvalidFiles:
@@ -164,10 +202,8 @@ class TestInvalidFiles:
         ws = wb.active
         ws.append(["Unknown Col 1", "Unknown Col 2"])
         ws.append(["val1", "val2"])
-        buf = io.BytesIO()
-        wb.save(buf)
         with pytest.raises(FileProcessingError, match="No recognized column"):
-            parser.parse(buf.getvalue())
+            parser.parse(_save_uncompressed(wb))
 
 
 class TestMultipleRecords:
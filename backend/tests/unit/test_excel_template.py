@@ -3,29 +3,62 @@
 import io
 
 import pytest
-from httpx import ASGITransport, AsyncClient
+from fastapi.testclient import TestClient
 from openpyxl import load_workbook
 
 from app.main import app
-from app.services.excel_template import COLUMNS, ExcelTemplateService
+from app.services.excel_parser import ExcelParserService
+from app.services.excel_template import (
+    COLUMN_HEADER_SET,
+    COLUMN_HEADERS,
+    ExcelTemplateService,
+)
 
+# Keep the module on one xdist worker (also under --dist loadgroup) so the
+# session-scoped workbook fixtures are built once; everything here only reads
+# the in-memory template.
+pytestmark = pytest.mark.xdist_group("template")
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def service() -> ExcelTemplateService:
     return ExcelTemplateService()
 
 
-@pytest.fixture
-def workbook(service: ExcelTemplateService):
-    content = service.generate()
-    return load_workbook(io.BytesIO(content))
+@pytest.fixture(scope="session")
+def workbook_ro(service: ExcelTemplateService):
+    """Read-only, values-only load for tests that just inspect cell values.
+
+    Loaded once; the template is deterministic and tests only read it.
+    """
+    return load_workbook(io.BytesIO(service.generate()), read_only=True, data_only=True)
+
+
+@pytest.fixture(scope="session")
+def workbook_full(service: ExcelTemplateService):
+    """Full load for tests that need sheet metadata (validations, panes)."""
+    return load_workbook(io.BytesIO(service.generate()))
+
+
+@pytest.fixture(scope="session")
+def validations_by_formula(workbook_full) -> dict:
+    """Data-sheet validations keyed by their unquoted list formula (e.g. "F,M,X")."""
+    ws = workbook_full["Vaccination Records"]
+    return {
+        dv.formula1.strip('"'): dv
+        for dv in ws.data_validations.dataValidation
+        if dv.formula1
+    }
 
 
-@pytest.fixture
-async def client():
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+def _row(ws, row: int, max_col: int | None = None) -> tuple:
+    """Values of a single sheet row, read in one iter_rows pass."""
+    return next(ws.iter_rows(min_row=row, max_row=row, max_col=max_col, values_only=True))
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    return TestClient(app)
 
 
 class TestTemplateGeneration:
@@ -36,39 +69,40 @@ class TestTemplateGeneration:
         assert isinstance(content, bytes)
         assert len(content) > 0
 
+    def test_generate_reuses_rendered_bytes(self, service: ExcelTemplateService) -> None:
+        assert service.generate() is ExcelTemplateService().generate()
+
     def test_is_valid_xlsx(self, service: ExcelTemplateService) -> None:
         content = service.generate()
         wb = load_workbook(io.BytesIO(content))
         assert wb is not None
         wb.close()
 
-    def test_has_two_sheets(self, workbook) -> None:
-        assert len(workbook.sheetnames) == 2
+    def test_has_two_sheets(self, workbook_ro) -> None:
+        assert len(workbook_ro.sheetnames) == 2
 
-    def test_first_sheet_is_vaccination_records(self, workbook) -> None:
-        assert workbook.sheetnames[0] == "Vaccination Records"
+    def test_first_sheet_is_vaccination_records(self, workbook_ro) -> None:
+        assert workbook_ro.sheetnames[0] == "Vaccination Records"
 
-    def test_second_sheet_is_instructions(self, workbook) -> None:
-        assert workbook.sheetnames[1] == "Instructions"
+    def test_second_sheet_is_instructions(self, workbook_ro) -> None:
+        assert workbook_ro.sheetnames[1] == "Instructions"
 
 
 class TestDataSheet:
     """Test the vaccination records data sheet."""
 
-    def test_has_correct_number_of_columns(self, workbook) -> None:
-        ws = workbook["Vaccination Records"]
-        header_count = sum(1 for cell in ws[1] if cell.value is not None)
-        assert header_count == len(COLUMNS)
+    def test_has_correct_number_of_columns(self, workbook_ro) -> None:
+        ws = workbook_ro["Vaccination Records"]
+        header_count = sum(1 for value in _row(ws, 1) if value is not None)
+        assert header_count == len(COLUMN_HEADERS)
 
-    def test_column_headers_match_spec(self, workbook) -> None:
-        ws = workbook["Vaccination Records"]
-        for col_idx, col_def in enumerate(COLUMNS, start=1):
-            assert ws.cell(row=1, column=col_idx).value == col_def["header"]
+    def test_column_headers_match_spec(self, workbook_ro) -> None:
+        headers = _row(workbook_ro["Vaccination Records"], 1, max_col=len(COLUMN_HEADERS))
+        assert headers == COLUMN_HEADERS
 
-    def test_column_order_matches_claude_md(self, workbook) -> None:
+    def test_column_order_matches_claude_md(self, workbook_ro) -> None:
         """Verify columns A-S match the exact order from claude.md."""
-        ws = workbook["Vaccination Records"]
-        expected_order = [
+        expected_order = (
             "Medicare Card Number",
             "Medicare IRN",
             "IHI Number",
@@ -88,35 +122,34 @@ class TestDataSheet:
             "Immunising Provider Number",
             "School ID",
             "Antenatal Indicator",
-        ]
-        for col_idx, expected in enumerate(expected_order, start=1):
-            assert ws.cell(row=1, column=col_idx).value == expected
+        )
+        assert COLUMN_HEADERS == expected_order
+        headers = _row(workbook_ro["Vaccination Records"], 1, max_col=len(expected_order))
+        assert headers == expected_order
 
-    def test_has_sample_data_row(self, workbook) -> None:
-        ws = workbook["Vaccination Records"]
+    def test_has_sample_data_row(self, workbook_ro) -> None:
         # Row 2 should have sample data
-        non_empty = sum(1 for cell in ws[2] if cell.value is not None and cell.value != "")
+        sample = _row(workbook_ro["Vaccination Records"], 2)
+        non_empty = sum(1 for value in sample if value is not None and value != "")
         assert non_empty > 0
 
-    def test_sample_medicare_number(self, workbook) -> None:
-        ws = workbook["Vaccination Records"]
-        assert ws.cell(row=2, column=1).value == "2123456789"
+    def test_sample_medicare_number(self, workbook_ro) -> None:
+        assert _row(workbook_ro["Vaccination Records"], 2)[0] == "2123456789"
 
-    def test_sample_gender(self, workbook) -> None:
-        ws = workbook["Vaccination Records"]
-        assert ws.cell(row=2, column=7).value == "F"
+    def test_sample_gender(self, workbook_ro) -> None:
+        assert _row(workbook_ro["Vaccination Records"], 2)[6] == "F"
 
-    def test_header_row_is_frozen(self, workbook) -> None:
-        ws = workbook["Vaccination Records"]
+    def test_header_row_is_frozen(self, workbook_full) -> None:
+        ws = workbook_full["Vaccination Records"]
         assert ws.freeze_panes == "A2"
 
 
 class TestDataValidations:
     """Test that dropdown validations are present and correct."""
 
-    def _get_validations(self, workbook) -> dict:
+    def _get_validations(self, workbook_full) -> dict:
         """Extract data validations keyed by column letter."""
-        ws = workbook["Vaccination Records"]
+        ws = workbook_full["Vaccination Records"]
         validations = {}
         for dv in ws.data_validations.dataValidation:
             for cell_range in dv.sqref.ranges:
@@ -126,106 +159,83 @@ class TestDataValidations:
                 validations[col] = dv
         return validations
 
-    def test_gender_dropdown_values(self, workbook) -> None:
+    def test_gender_dropdown_values(self, validations_by_formula) -> None:
         """Gender dropdown must have F, M, X per AIR V6.0.7 spec."""
-        ws = workbook["Vaccination Records"]
-        gender_dv = None
-        for dv in ws.data_validations.dataValidation:
-            if dv.formula1 and "F,M,X" in dv.formula1:
-                gender_dv = dv
-                break
-        assert gender_dv is not None, "Gender validation with F,M,X not found"
+        assert "F,M,X" in validations_by_formula, "Gender validation with F,M,X not found"
 
-    def test_vaccine_type_dropdown(self, workbook) -> None:
+    def test_vaccine_type_dropdown(self, validations_by_formula) -> None:
         """Vaccine Type must include NIP, OTH per AIR V6.0.7."""
-        ws = workbook["Vaccination Records"]
-        vtype_dv = None
-        for dv in ws.data_validations.dataValidation:
-            if dv.formula1 and "NIP,OTH" in dv.formula1:
-                vtype_dv = dv
-                break
-        assert vtype_dv is not None, "Vaccine Type validation with NIP,OTH not found"
+        assert "NIP,OTH" in validations_by_formula, "Vaccine Type validation with NIP,OTH not found"
 
-    def test_route_dropdown_values(self, workbook) -> None:
+    def test_route_dropdown_values(self, validations_by_formula) -> None:
         """Route must have PO, SC, ID, IM, NS per AIR V6.0.7 spec."""
-        ws = workbook["Vaccination Records"]
-        route_dv = None
-        for dv in ws.data_validations.dataValidation:
-            if dv.formula1 and "PO,SC,ID,IM,NS" in dv.formula1:
-                route_dv = dv
-                break
-        assert route_dv is not None, "Route validation with PO,SC,ID,IM,NS not found"
-
-    def test_overseas_dropdown(self, workbook) -> None:
-        ws = workbook["Vaccination Records"]
-        found = any(
-            dv.formula1 and "TRUE,FALSE" in dv.formula1
-            for dv in ws.data_validations.dataValidation
+        assert "PO,SC,ID,IM,NS" in validations_by_formula, (
+            "Route validation with PO,SC,ID,IM,NS not found"
         )
-        assert found, "TRUE/FALSE validation not found"
 
-    def test_has_five_validations(self, workbook) -> None:
+    def test_overseas_dropdown(self, validations_by_formula) -> None:
+        assert "TRUE,FALSE" in validations_by_formula, "TRUE/FALSE validation not found"
+
+    def test_has_five_validations(self, workbook_full) -> None:
         """Should have 5 data validations: gender, vaccine type, route, overseas, antenatal."""
-        ws = workbook["Vaccination Records"]
+        ws = workbook_full["Vaccination Records"]
         assert len(ws.data_validations.dataValidation) == 5
 
 
 class TestInstructionsSheet:
     """Test the instructions sheet content."""
 
-    def test_has_title(self, workbook) -> None:
-        ws = workbook["Instructions"]
-        assert "Column Reference" in str(ws.cell(row=1, column=1).value)
+    def test_has_title(self, workbook_ro) -> None:
+        ws = workbook_ro["Instructions"]
+        assert "Column Reference" in str(_row(ws, 1)[0])
 
-    def test_has_identification_requirements(self, workbook) -> None:
-        ws = workbook["Instructions"]
+    def test_has_identification_requirements(self, workbook_ro) -> None:
+        ws = workbook_ro["Instructions"]
         # Check rows 3-7 area for identification info
         content = " ".join(
-            str(ws.cell(row=r, column=1).value or "") for r in range(3, 8)
+            str(row[0] or "")
+            for row in ws.iter_rows(min_row=3, max_row=7, max_col=1, values_only=True)
         )
         assert "Medicare" in content
         assert "IHI" in content
 
-    def test_has_column_reference_table(self, workbook) -> None:
-        ws = workbook["Instructions"]
+    def test_has_column_reference_table(self, workbook_ro) -> None:
         # Row 9 should have column reference headers
-        assert ws.cell(row=9, column=1).value == "Column"
-        assert ws.cell(row=9, column=2).value == "Header"
+        row = _row(workbook_ro["Instructions"], 9)
+        assert row[0] == "Column"
+        assert row[1] == "Header"
+
+    def test_all_columns_documented(self, workbook_ro) -> None:
+        ws = workbook_ro["Instructions"]
+        documented_headers = tuple(
+            value
+            for (value,) in ws.iter_rows(
+                min_row=10, max_row=9 + len(COLUMN_HEADERS), min_col=2, max_col=2, values_only=True
+            )
+            if value
+        )
+        assert documented_headers == COLUMN_HEADERS
+        assert set(documented_headers) == COLUMN_HEADER_SET
+
 
-    def test_all_columns_documented(self, workbook) -> None:
-        ws = workbook["Instructions"]
-        documented_headers = []
-        for row in range(10, 10 + len(COLUMNS)):
-            val = ws.cell(row=row, column=2).value
-            if val:
-                documented_headers.append(val)
-        assert len(documented_headers) == len(COLUMNS)
+@pytest.fixture(scope="session")
+def parsed_template(service: ExcelTemplateService) -> dict:
+    """The generated template run through ExcelParserService once."""
+    return ExcelParserService().parse(service.generate())
 
 
 class TestTemplateRoundTrip:
     """Test that a generated template can be parsed by ExcelParserService."""
 
-    def test_template_parseable_by_excel_parser(self, service: ExcelTemplateService) -> None:
+    def test_template_parseable_by_excel_parser(self, parsed_template: dict) -> None:
         """Generated template should be parseable by our Excel parser."""
-        from app.services.excel_parser import ExcelParserService
-
-        content = service.generate()
-        parser = ExcelParserService()
-        result = parser.parse(content)
-
         # Should parse the sample row
-        assert result["totalRows"] == 1
-        assert result["validRecords"] >= 1
-
-    def test_parsed_sample_has_expected_fields(self, service: ExcelTemplateService) -> None:
-        from app.services.excel_parser import ExcelParserService
-
-        content = service.generate()
-        parser = ExcelParserService()
-        result = parser.parse(content)
+        assert parsed_template["totalRows"] == 1
+        assert parsed_template["validRecords"] >= 1
 
-        if result["validRecords"] > 0:
-            record = result["records"][0]
+    def test_parsed_sample_has_expected_fields(self, parsed_template: dict) -> None:
+        if parsed_template["validRecords"] > 0:
+            record = parsed_template["records"][0]
             assert record["medicareCardNumber"] == "2123456789"
             assert record["gender"] == "F"
             assert record["vaccineCode"] == "COMIRN"
@@ -234,24 +244,20 @@ class TestTemplateRoundTrip:
 class TestTemplateEndpoint:
     """Test the template download API endpoint."""
 
-    @pytest.mark.anyio
-    async def test_download_returns_200(self, client) -> None:
-        response = await client.get("/api/template")
+    def test_download_returns_200(self, client) -> None:
+        response = client.get("/api/template")
         assert response.status_code == 200
 
-    @pytest.mark.anyio
-    async def test_download_content_type(self, client) -> None:
-        response = await client.get("/api/template")
+    def test_download_content_type(self, client) -> None:
+        response = client.get("/api/template")
         assert "spreadsheetml" in response.headers["content-type"]
 
-    @pytest.mark.anyio
-    async def test_download_has_filename(self, client) -> None:
-        response = await client.get("/api/template")
+    def test_download_has_filename(self, client) -> None:
+        response = client.get("/api/template")
         assert "vaccination_template.xlsx" in response.headers["content-disposition"]
 
-    @pytest.mark.anyio
-    async def test_download_is_valid_xlsx(self, client) -> None:
-        response = await client.get("/api/template")
+    def test_download_is_valid_xlsx(self, client) -> None:
+        response = client.get("/api/template")
         wb = load_workbook(io.BytesIO(response.content))
         assert wb is not None
         wb.close()
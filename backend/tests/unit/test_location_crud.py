@@ -1,11 +1,33 @@
 """Tests for Location CRUD — schemas, manager, router."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from dataclasses import dataclass
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.routers.locations import get_location_manager
 from app.schemas.location import LocationCreate, LocationRead, LocationUpdate
+from app.services.location_manager import LocationManager
+
+
+@dataclass(slots=True)
+class _FakeLocation:
+    """ORM-like Location row; plain slots instead of MagicMock attribute lookups."""
+
+    id: int = 1
+    organisation_id: int = 1
+    name: str = "Test"
+    address_line_1: str = ""
+    address_line_2: str = ""
+    suburb: str = ""
+    state: str = ""
+    postcode: str = ""
+    minor_id: str = "001"
+    proda_link_status: str = "pending"
+    status: str = "active"
+    created_at: str = "2026-01-01T00:00:00+00:00"
+    updated_at: str = "2026-01-01T00:00:00+00:00"
 
 
 # --- Schema tests ---
@@ -48,42 +70,34 @@ class TestLocationUpdate:
 class TestLocationRead:
     def test_from_attributes(self):
         """LocationRead should accept ORM-like objects."""
-        mock = MagicMock()
-        mock.id = 1
-        mock.organisation_id = 1
-        mock.name = "Test"
-        mock.address_line_1 = ""
-        mock.address_line_2 = ""
-        mock.suburb = ""
-        mock.state = ""
-        mock.postcode = ""
-        mock.minor_id = "001"
-        mock.proda_link_status = "pending"
-        mock.status = "active"
-        mock.created_at = "2026-01-01T00:00:00+00:00"
-        mock.updated_at = "2026-01-01T00:00:00+00:00"
-
-        read = LocationRead.model_validate(mock, from_attributes=True)
+        read = LocationRead.model_validate(_FakeLocation(), from_attributes=True)
         assert read.id == 1
         assert read.minor_id == "001"
 
 
 # --- LocationManager tests (mocked DB) ---
 
+class _FakeDB:
+    """Session stand-in with only the calls LocationManager makes.
+
+    Plain attributes instead of an AsyncMock root, which builds child mocks
+    on every attribute access.
+    """
+
+    def __init__(self) -> None:
+        self.execute = AsyncMock()
+        self.commit = AsyncMock()
+        self.refresh = AsyncMock()
+        self.add = MagicMock()
+
+
 class TestLocationManager:
     @pytest.fixture
     def mock_db(self):
-        db = AsyncMock()
-        db.execute = AsyncMock()
-        db.commit = AsyncMock()
-        db.refresh = AsyncMock()
-        db.add = MagicMock()
-        return db
+        return _FakeDB()
 
     @pytest.mark.asyncio
     async def test_get_returns_none(self, mock_db):
-        from app.services.location_manager import LocationManager
-
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = None
         mock_db.execute.return_value = mock_result
@@ -94,11 +108,7 @@ class TestLocationManager:
 
     @pytest.mark.asyncio
     async def test_get_returns_location(self, mock_db):
-        from app.services.location_manager import LocationManager
-
-        mock_loc = MagicMock()
-        mock_loc.id = 1
-        mock_loc.name = "Clinic"
+        mock_loc = _FakeLocation(name="Clinic")
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = mock_loc
         mock_db.execute.return_value = mock_result
@@ -109,11 +119,7 @@ class TestLocationManager:
 
     @pytest.mark.asyncio
     async def test_deactivate_sets_inactive(self, mock_db):
-        from app.services.location_manager import LocationManager
-
-        mock_loc = MagicMock()
-        mock_loc.id = 1
-        mock_loc.status = "active"
+        mock_loc = _FakeLocation()
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = mock_loc
         mock_db.execute.return_value = mock_result
@@ -124,12 +130,7 @@ class TestLocationManager:
 
     @pytest.mark.asyncio
     async def test_update_strips_minor_id(self, mock_db):
-        from app.services.location_manager import LocationManager
-
-        mock_loc = MagicMock()
-        mock_loc.id = 1
-        mock_loc.name = "Old"
-        mock_loc.minor_id = "001"
+        mock_loc = _FakeLocation(name="Old")
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = mock_loc
         mock_db.execute.return_value = mock_result
@@ -141,8 +142,6 @@ class TestLocationManager:
 
     @pytest.mark.asyncio
     async def test_get_minor_id(self, mock_db):
-        from app.services.location_manager import LocationManager
-
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = "MI-001"
         mock_db.execute.return_value = mock_result
@@ -153,8 +152,6 @@ class TestLocationManager:
 
     @pytest.mark.asyncio
     async def test_verify_provider_linked_true(self, mock_db):
-        from app.services.location_manager import LocationManager
-
         mock_result = MagicMock()
         mock_result.scalar_one.return_value = 1
         mock_db.execute.return_value = mock_result
@@ -165,8 +162,6 @@ class TestLocationManager:
 
     @pytest.mark.asyncio
     async def test_verify_provider_linked_false(self, mock_db):
-        from app.services.location_manager import LocationManager
-
         mock_result = MagicMock()
         mock_result.scalar_one.return_value = 0
         mock_db.execute.return_value = mock_result
@@ -177,16 +172,13 @@ class TestLocationManager:
 
     @pytest.mark.asyncio
     async def test_get_unlinked_providers_empty_list(self, mock_db):
-        from app.services.location_manager import LocationManager
-
         mgr = LocationManager(mock_db)
         result = await mgr.get_unlinked_providers(1, [])
         assert result == []
+        mock_db.execute.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_get_unlinked_providers_some_unlinked(self, mock_db):
-        from app.services.location_manager import LocationManager
-
         mock_result = MagicMock()
         mock_result.all.return_value = [("1234567A",)]
         mock_db.execute.return_value = mock_result
@@ -199,13 +191,14 @@ class TestLocationManager:
 # --- Router tests (mocked dependencies) ---
 
 class TestLocationsRouter:
-    @pytest.fixture
-    def client(self):
+    @pytest.fixture(scope="session")
+    def router_app(self):
+        """Bare app (no middleware) built once; the auth/DB overrides are constant."""
         from app.main import create_app
         from app.database import get_db
         from app.dependencies import get_current_user
 
-        app = create_app()
+        app = create_app(with_middleware=False)
 
         async def mock_db():
             yield AsyncMock()
@@ -220,32 +213,35 @@ class TestLocationsRouter:
 
         app.dependency_overrides[get_db] = mock_db
         app.dependency_overrides[get_current_user] = mock_auth
-        return TestClient(app)
+        return app
 
-    @patch("app.routers.locations.LocationManager")
-    def test_get_location_not_found(self, MockManager, client):
-        mock_mgr = AsyncMock()
+    @pytest.fixture(scope="session")
+    def client(self, router_app):
+        return TestClient(router_app, raise_server_exceptions=False)
+
+    @pytest.fixture
+    def mock_mgr(self, router_app):
+        """Per-test LocationManager double injected through the dependency."""
+        mgr = AsyncMock()
+        router_app.dependency_overrides[get_location_manager] = lambda: mgr
+        yield mgr
+        del router_app.dependency_overrides[get_location_manager]
+
+    def test_get_location_not_found(self, mock_mgr, client):
         mock_mgr.get.return_value = None
-        MockManager.return_value = mock_mgr
 
         response = client.get("/api/locations/999")
         assert response.status_code == 404
 
-    @patch("app.routers.locations.LocationManager")
-    def test_list_locations(self, MockManager, client):
-        mock_mgr = AsyncMock()
+    def test_list_locations(self, mock_mgr, client):
         mock_mgr.list_active.return_value = []
-        MockManager.return_value = mock_mgr
 
         response = client.get("/api/locations")
         assert response.status_code == 200
         assert response.json() == []
 
-    @patch("app.routers.locations.LocationManager")
-    def test_delete_not_found(self, MockManager, client):
-        mock_mgr = AsyncMock()
+    def test_delete_not_found(self, mock_mgr, client):
         mock_mgr.deactivate.return_value = None
-        MockManager.return_value = mock_mgr
 
         response = client.delete("/api/locations/999")
         assert response.status_code == 404
@@ -1,17 +1,37 @@
 """Tests for ORM models — instantiation, table registration, and field access."""
 
 import pytest
+
 from app.models import (
-    Base,
     AuditLog,
-    Organisation,
+    Base,
     Location,
     LocationProvider,
+    Organisation,
     SubmissionBatch,
     SubmissionRecord,
 )
 
 
+_EXPECTED_COLUMNS: dict[str, set[str]] = {
+    "locations": {"minor_id", "organisation_id", "proda_link_status"},
+    "submission_batches": {"file_name", "total_records", "status", "location_id", "environment"},
+    "submission_records": {
+        "batch_id", "row_number", "request_payload", "air_status_code", "confirmation_status",
+    },
+    "audit_log": {"action", "user_id", "details", "ip_address"},
+}
+
+
+@pytest.fixture(scope="module")
+def table_columns() -> dict[str, set[str]]:
+    """Column names per registered table, snapshotted once for the module."""
+    return {
+        name: {c.name for c in table.columns}
+        for name, table in Base.metadata.tables.items()
+    }
+
+
 class TestOrganisationModel:
     def test_instantiation(self):
         org = Organisation(
@@ -74,17 +94,15 @@ class TestLocationProviderModel:
 
 
 class TestBaseMetadata:
-    def test_all_tables_registered(self):
-        table_names = set(Base.metadata.tables.keys())
-        assert "organisations" in table_names
-        assert "locations" in table_names
-        assert "location_providers" in table_names
-
-    def test_location_has_expected_columns(self):
-        cols = {c.name for c in Base.metadata.tables["locations"].columns}
-        assert "minor_id" in cols
-        assert "organisation_id" in cols
-        assert "proda_link_status" in cols
+    def test_all_tables_registered(self, table_columns):
+        assert {
+            "organisations", "locations", "location_providers",
+            "submission_batches", "submission_records", "audit_log",
+        } <= table_columns.keys()
+
+    @pytest.mark.parametrize("table, required", list(_EXPECTED_COLUMNS.items()))
+    def test_table_has_columns(self, table_columns, table, required):
+        assert required <= table_columns[table]
 
     def test_location_providers_has_unique_constraint(self):
         table = Base.metadata.tables["location_providers"]
@@ -210,32 +228,3 @@ class TestAuditLogModel:
             details={"batch_id": 42, "records": 100},
         )
         assert log.details["batch_id"] == 42
-
-    def test_tables_registered(self):
-        table_names = set(Base.metadata.tables.keys())
-        assert "submission_batches" in table_names
-        assert "submission_records" in table_names
-        assert "audit_log" in table_names
-
-    def test_submission_batches_columns(self):
-        cols = {c.name for c in Base.metadata.tables["submission_batches"].columns}
-        assert "file_name" in cols
-        assert "total_records" in cols
-        assert "status" in cols
-        assert "location_id" in cols
-        assert "environment" in cols
-
-    def test_submission_records_columns(self):
-        cols = {c.name for c in Base.metadata.tables["submission_records"].columns}
-        assert "batch_id" in cols
-        assert "row_number" in cols
-        assert "request_payload" in cols
-        assert "air_status_code" in cols
-        assert "confirmation_status" in cols
-
-    def test_audit_log_columns(self):
-        cols = {c.name for c in Base.metadata.tables["audit_log"].columns}
-        assert "action" in cols
-        assert "user_id" in cols
-        assert "details" in cols
-        assert "ip_address" in cols
@@ -2,95 +2,313 @@
 
 Tests the parse → validate → group pipeline with 150+ records.
 Target: <60 seconds wall-clock, no memory leaks.
+
+Marked slow and deselected by default; run with ``pytest -m slow``.
 """
 
+import gc
 import io
+import os
 import time
-import tracemalloc
+import zipfile
+from itertools import cycle
 from typing import Any
+from xml.sax.saxutils import escape
 
 import pytest
-from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
 
 from app.services.batch_grouping import BatchGroupingService
 from app.services.excel_parser import ExcelParserService
 from app.services.validation_engine import ValidationOrchestrator
 
+# Pin the module to one xdist worker (also under --dist loadgroup) so the
+# session fixtures are built once. The retained-memory test reads this
+# worker's own RSS, so other workers running in parallel do not skew it.
+pytestmark = pytest.mark.xdist_group("performance")
 
-def _generate_test_workbook(num_rows: int) -> bytes:
-    """Generate an Excel workbook with the specified number of vaccination rows."""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Vaccination Records"
-
-    headers = [
-        "Medicare Card Number", "Medicare IRN", "IHI Number",
-        "First Name", "Last Name", "Date of Birth", "Gender",
-        "Postcode", "Date of Service", "Vaccine Code", "Vaccine Dose",
-        "Vaccine Batch", "Vaccine Type", "Route of Administration",
-        "Administered Overseas", "Country Code",
-        "Immunising Provider Number", "School ID", "Antenatal Indicator",
-    ]
-    for col_idx, header in enumerate(headers, start=1):
-        ws.cell(row=1, column=col_idx, value=header)
 
-    # Generate rows with varied individuals
+def _current_rss_bytes() -> int | None:
+    """Current resident set size from /proc/self/statm, or None off Linux.
+
+    Not ru_maxrss: that is the process-lifetime high-water mark, so it stays
+    flat whenever an earlier test on the worker already peaked higher.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _generate_records(num_rows: int) -> list[dict[str, Any]]:
+    """Generate vaccination records in the shape ExcelParserService.parse returns.
+
+    The downstream validate/group tests consume these directly; the workbook
+    generator writes the same records out as sheet rows.
+    """
+    # Generate rows with varied individuals. Every field is a function of
+    # the individual (i % 30) or of a short row cycle, so format each
+    # distinct value once and cycle through the tables row by row.
     genders = ["M", "F", "X"]
     vaccine_codes = ["COMIRN", "INFLVX", "ADACEL", "GARDSQ", "PRIORC", "HEPBVX"]
     routes = ["IM", "SC", "PO", "ID", "NS"]
     types = ["NIP", "OTH"]
 
-    for i in range(num_rows):
-        row = i + 2
-        individual_idx = i % 30  # 30 unique individuals
-        medicare = f"2{individual_idx:03d}45678{(individual_idx % 10)}"
-        irn = str((individual_idx % 9) + 1)
-        dob_day = (individual_idx % 28) + 1
-        dob_month = (individual_idx % 12) + 1
-
-        ws.cell(row=row, column=1, value=medicare)
-        ws.cell(row=row, column=2, value=irn)
-        ws.cell(row=row, column=3, value="")
-        ws.cell(row=row, column=4, value=f"Test{individual_idx}")
-        ws.cell(row=row, column=5, value=f"Patient{individual_idx}")
-        ws.cell(row=row, column=6, value=f"{dob_day:02d}/01/1990")
-        ws.cell(row=row, column=7, value=genders[individual_idx % 3])
-        ws.cell(row=row, column=8, value=f"{2000 + (individual_idx % 100):04d}")
-        # Vary dates of service across rows
-        dos_day = (i % 28) + 1
-        dos_month = (i % 12) + 1
-        ws.cell(row=row, column=9, value=f"{dos_day:02d}/{dos_month:02d}/2025")
-        ws.cell(row=row, column=10, value=vaccine_codes[i % len(vaccine_codes)])
-        ws.cell(row=row, column=11, value=str((i % 3) + 1))
-        ws.cell(row=row, column=12, value=f"BN{i:04d}")
-        ws.cell(row=row, column=13, value=types[i % len(types)])
-        ws.cell(row=row, column=14, value=routes[i % len(routes)])
-        ws.cell(row=row, column=15, value="FALSE")
-        ws.cell(row=row, column=16, value="")
-        ws.cell(row=row, column=17, value="1234567A")
-        ws.cell(row=row, column=18, value="")
-        ws.cell(row=row, column=19, value="FALSE")
+    individuals = [  # 30 unique individuals
+        {
+            "medicareCardNumber": f"2{k:03d}45678{(k % 10)}",
+            "medicareIRN": str((k % 9) + 1),
+            "firstName": f"Test{k}",
+            "lastName": f"Patient{k}",
+            "dateOfBirth": f"1990-01-{(k % 28) + 1:02d}",
+            "gender": genders[k % 3],
+            "postCode": f"{2000 + (k % 100):04d}",
+        }
+        for k in range(30)
+    ]
+    # Vary dates of service across rows; day and month cycles repeat every 84
+    dates_of_service = [f"2025-{(j % 12) + 1:02d}-{(j % 28) + 1:02d}" for j in range(84)]
+    doses = ["1", "2", "3"]
+
+    columns = zip(
+        range(num_rows),
+        cycle(individuals),
+        cycle(dates_of_service),
+        cycle(vaccine_codes),
+        cycle(doses),
+        cycle(types),
+        cycle(routes),
+    )
+    records: list[dict[str, Any]] = []
+    for i, individual, date_of_service, vaccine_code, dose, vaccine_type, route in columns:
+        records.append({
+            "rowNumber": i + 2,
+            **individual,
+            "dateOfService": date_of_service,
+            "vaccineCode": vaccine_code,
+            "vaccineDose": dose,
+            "vaccineBatch": f"BN{i:04d}",
+            "vaccineType": vaccine_type,
+            "routeOfAdministration": route,
+            "administeredOverseas": False,
+            "immunisingProviderNumber": "1234567A",
+            "antenatalIndicator": False,
+        })
+    return records
+
+
+def _dmy(iso_date: str) -> str:
+    """yyyy-MM-dd -> DD/MM/YYYY, the format users enter in the sheet."""
+    year, month, day = iso_date.split("-")
+    return f"{day}/{month}/{year}"
+
+
+_HEADERS = [
+    "Medicare Card Number", "Medicare IRN", "IHI Number",
+    "First Name", "Last Name", "Date of Birth", "Gender",
+    "Postcode", "Date of Service", "Vaccine Code", "Vaccine Dose",
+    "Vaccine Batch", "Vaccine Type", "Route of Administration",
+    "Administered Overseas", "Country Code",
+    "Immunising Provider Number", "School ID", "Antenatal Indicator",
+]
+
+
+def _sheet_rows(num_rows: int) -> list[list[str]]:
+    """Header plus one sheet row per generated record, as users would enter them."""
+    rows = [_HEADERS]
+    for rec in _generate_records(num_rows):
+        rows.append([
+            rec["medicareCardNumber"],
+            rec["medicareIRN"],
+            "",
+            rec["firstName"],
+            rec["lastName"],
+            _dmy(rec["dateOfBirth"]),
+            rec["gender"],
+            rec["postCode"],
+            _dmy(rec["dateOfService"]),
+            rec["vaccineCode"],
+            rec["vaccineDose"],
+            rec["vaccineBatch"],
+            rec["vaccineType"],
+            rec["routeOfAdministration"],
+            "FALSE",
+            "",
+            rec["immunisingProviderNumber"],
+            "",
+            "FALSE",
+        ])
+    return rows
+
+
+def _generate_test_workbook(num_rows: int) -> bytes:
+    """Generate an Excel workbook with the specified number of vaccination rows.
+
+    Reference path through openpyxl; the fixtures use _make_xlsx_bytes.
+    """
+    # Only this reference path needs the writer side of openpyxl
+    from openpyxl import Workbook
+
+    # write_only streams appended rows to the writer without keeping Cells
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Vaccination Records")
+    for row in _sheet_rows(num_rows):
+        ws.append(row)
 
     buf = io.BytesIO()
     wb.save(buf)
-    buf.seek(0)
     return buf.getvalue()
 
 
-class TestPerformance150Records:
-    """Performance tests with 150 records."""
+# Minimal SpreadsheetML package parts for a single inline-string sheet
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Vaccination Records" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _make_xlsx_bytes(rows: list[list[str]]) -> bytes:
+    """Emit an .xlsx of inline-string cells directly, bypassing openpyxl.
+
+    Empty strings are left out, matching what openpyxl writes for them.
+    """
+    letters = [get_column_letter(c) for c in range(1, max(map(len, rows)) + 1)]
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+    ]
+    for r, row in enumerate(rows, start=1):
+        parts.append(f'<row r="{r}">')
+        parts.extend(
+            f'<c r="{letters[c]}{r}" t="inlineStr"><is><t>{escape(value)}</t></is></c>'
+            for c, value in enumerate(row)
+            if value != ""
+        )
+        parts.append("</row>")
+    parts.append("</sheetData></worksheet>")
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _XLSX_WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        zf.writestr("xl/worksheets/sheet1.xml", "".join(parts))
+    return buf.getvalue()
+
+
+# Workbook bytes are immutable and only read, so build each size once.
+@pytest.fixture(scope="session")
+def workbook_150() -> bytes:
+    return _make_xlsx_bytes(_sheet_rows(150))
+
+
+@pytest.fixture(scope="session")
+def workbook_500() -> bytes:
+    return _make_xlsx_bytes(_sheet_rows(500))
+
+
+# Records for the 150-row validate/group tests, which skip the XLSX round trip;
+# validation and grouping do not mutate the records. Generating them is cheaper
+# than loading a frozen JSON copy, and test_generated_records_match_parsed_workbook
+# keeps them in step with the parser.
+@pytest.fixture(scope="session")
+def records_150() -> list[dict[str, Any]]:
+    return _generate_records(150)
+
+
+# The services hold no per-call state, so one instance of each is shared.
+@pytest.fixture(scope="session")
+def parser() -> ExcelParserService:
+    return ExcelParserService()
+
+
+@pytest.fixture(scope="session")
+def validator() -> ValidationOrchestrator:
+    return ValidationOrchestrator()
+
+
+@pytest.fixture(scope="session")
+def grouper() -> BatchGroupingService:
+    return BatchGroupingService()
+
 
-    @pytest.fixture
-    def workbook_150(self) -> bytes:
-        return _generate_test_workbook(150)
+@pytest.fixture(scope="session")
+def pipeline_500(
+    parser: ExcelParserService,
+    validator: ValidationOrchestrator,
+    grouper: BatchGroupingService,
+    workbook_500: bytes,
+) -> dict[str, Any]:
+    """Run the 500-row parse → validate → group pipeline once.
 
-    @pytest.fixture
-    def workbook_500(self) -> bytes:
-        return _generate_test_workbook(500)
+    Records wall time and retained RSS (after the run, with outputs still
+    held) alongside the outputs so the 500-row tests each assert their own
+    property without re-running it.
+    """
+    gc.collect()
+    start_rss = _current_rss_bytes()
+    start = time.monotonic()
 
-    def test_parse_150_records(self, workbook_150: bytes) -> None:
+    parsed = parser.parse(workbook_500)
+    validated = validator.validate(parsed["records"])
+    batches = grouper.group(parsed["records"])
+
+    elapsed = time.monotonic() - start
+    gc.collect()
+    end_rss = _current_rss_bytes()
+    return {
+        "parsed": parsed,
+        "validated": validated,
+        "batches": batches,
+        "elapsed": elapsed,
+        "retained_rss_mb": (
+            None if start_rss is None or end_rss is None
+            else (end_rss - start_rss) / (1024 * 1024)
+        ),
+    }
+
+
+@pytest.mark.slow
+class TestPerformance150Records:
+    """Performance tests with 150 records."""
+
+    def test_parse_150_records(
+        self, parser: ExcelParserService, workbook_150: bytes
+    ) -> None:
         """Parse 150 records within acceptable time."""
-        parser = ExcelParserService()
         start = time.monotonic()
         result = parser.parse(workbook_150)
         elapsed = time.monotonic() - start
@@ -99,28 +317,36 @@ class TestPerformance150Records:
         assert result["validRecords"] >= 140  # Allow some validation variance
         assert elapsed < 10.0, f"Parsing took {elapsed:.2f}s (limit: 10s)"
 
-    def test_validate_150_records(self, workbook_150: bytes) -> None:
+    def test_generated_records_match_parsed_workbook(
+        self, parser: ExcelParserService, workbook_150: bytes, records_150: list[dict[str, Any]]
+    ) -> None:
+        """The direct record fixtures must stay in step with the parser output."""
+        assert parser.parse(workbook_150)["records"] == records_150
+
+    def test_hand_built_workbook_parses_like_openpyxl(
+        self, parser: ExcelParserService, workbook_150: bytes
+    ) -> None:
+        """The zipfile-built fixture must read exactly like an openpyxl-written file."""
+        assert parser.parse(workbook_150) == parser.parse(_generate_test_workbook(150))
+
+    def test_validate_150_records(
+        self, validator: ValidationOrchestrator, records_150: list[dict[str, Any]]
+    ) -> None:
         """Validate 150 records within acceptable time."""
-        parser = ExcelParserService()
-        parsed = parser.parse(workbook_150)
-
-        validator = ValidationOrchestrator()
         start = time.monotonic()
-        result = validator.validate(parsed["records"])
+        result = validator.validate(records_150)
         elapsed = time.monotonic() - start
 
         assert elapsed < 10.0, f"Validation took {elapsed:.2f}s (limit: 10s)"
         # Validation completes for all records (some may fail due to generated data)
         assert result["totalRecords"] == 150
 
-    def test_group_150_records(self, workbook_150: bytes) -> None:
+    def test_group_150_records(
+        self, grouper: BatchGroupingService, records_150: list[dict[str, Any]]
+    ) -> None:
         """Group 150 records into batches within acceptable time."""
-        parser = ExcelParserService()
-        parsed = parser.parse(workbook_150)
-
-        grouper = BatchGroupingService()
         start = time.monotonic()
-        batches = grouper.group(parsed["records"])
+        batches = grouper.group(records_150)
         elapsed = time.monotonic() - start
 
         assert elapsed < 5.0, f"Grouping took {elapsed:.2f}s (limit: 5s)"
@@ -131,18 +357,17 @@ class TestPerformance150Records:
             for enc in batch["encounters"]:
                 assert len(enc["episodes"]) <= 5
 
-    def test_full_pipeline_150_records(self, workbook_150: bytes) -> None:
+    def test_full_pipeline_150_records(
+        self, parser, validator, grouper, workbook_150: bytes
+    ) -> None:
         """Full parse → validate → group pipeline under 60 seconds."""
         start = time.monotonic()
 
-        parser = ExcelParserService()
         parsed = parser.parse(workbook_150)
         assert parsed["totalRows"] == 150
 
-        validator = ValidationOrchestrator()
         validated = validator.validate(parsed["records"])
 
-        grouper = BatchGroupingService()
         batches = grouper.group(parsed["records"])
 
         elapsed = time.monotonic() - start
@@ -151,51 +376,29 @@ class TestPerformance150Records:
         assert len(batches) > 0
         assert validated["totalRecords"] == 150
 
-    def test_full_pipeline_500_records(self, workbook_500: bytes) -> None:
+    def test_full_pipeline_500_records(self, pipeline_500: dict[str, Any]) -> None:
         """Full pipeline with 500 records — stress test."""
-        start = time.monotonic()
-
-        parser = ExcelParserService()
-        parsed = parser.parse(workbook_500)
-        assert parsed["totalRows"] == 500
-
-        validator = ValidationOrchestrator()
-        validator.validate(parsed["records"])
-
-        grouper = BatchGroupingService()
-        batches = grouper.group(parsed["records"])
-
-        elapsed = time.monotonic() - start
-
+        assert pipeline_500["parsed"]["totalRows"] == 500
+        elapsed = pipeline_500["elapsed"]
         assert elapsed < 60.0, f"Full 500-record pipeline took {elapsed:.2f}s (limit: 60s)"
-        assert len(batches) > 0
-
-    def test_memory_usage_500_records(self, workbook_500: bytes) -> None:
-        """Verify no memory leak: peak memory <100MB for 500 records."""
-        tracemalloc.start()
-
-        parser = ExcelParserService()
-        parsed = parser.parse(workbook_500)
-
-        validator = ValidationOrchestrator()
-        validator.validate(parsed["records"])
-
-        grouper = BatchGroupingService()
-        grouper.group(parsed["records"])
-
-        _current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-
-        peak_mb = peak / (1024 * 1024)
-        assert peak_mb < 100.0, f"Peak memory: {peak_mb:.1f}MB (limit: 100MB)"
-
-    def test_batch_constraints_maintained(self, workbook_500: bytes) -> None:
+        assert len(pipeline_500["batches"]) > 0
+
+    def test_retained_memory_500_records(self, pipeline_500: dict[str, Any]) -> None:
+        """Verify no memory leak: the pipeline retains <100MB for 500 records.
+
+        A retained-memory check, not a peak one: RSS is sampled before the
+        pipeline and again after it has finished (outputs still held), so a
+        transient spike while parsing is not measured. Uses RSS rather than
+        tracemalloc, which slows every allocation in the traced region.
+        """
+        retained_mb = pipeline_500["retained_rss_mb"]
+        if retained_mb is None:
+            pytest.skip("current RSS is read from /proc/self/statm (Linux only)")
+        assert retained_mb < 100.0, f"Retained memory: {retained_mb:.1f}MB (limit: 100MB)"
+
+    def test_batch_constraints_maintained(self, pipeline_500: dict[str, Any]) -> None:
         """Verify all batch constraints hold with large record sets."""
-        parser = ExcelParserService()
-        parsed = parser.parse(workbook_500)
-
-        grouper = BatchGroupingService()
-        batches = grouper.group(parsed["records"])
+        batches = pipeline_500["batches"]
 
         total_encounters = 0
         total_episodes = 0
@@ -211,13 +414,11 @@ class TestPerformance150Records:
         assert total_episodes == 500
         assert total_encounters > 0
 
-    def test_row_traceability_preserved(self, workbook_150: bytes) -> None:
+    def test_row_traceability_preserved(
+        self, grouper: BatchGroupingService, records_150: list[dict[str, Any]]
+    ) -> None:
         """Verify original row numbers are preserved through the full pipeline."""
-        parser = ExcelParserService()
-        parsed = parser.parse(workbook_150)
-
-        grouper = BatchGroupingService()
-        batches = grouper.group(parsed["records"])
+        batches = grouper.group(records_150)
 
         all_source_rows: set[int] = set()
         for batch in batches:
@@ -226,7 +427,7 @@ class TestPerformance150Records:
                     if row is not None:
                         all_source_rows.add(row)
 
-        # Every parsed record should have its row tracked in a batch
-        parsed_rows = {r["rowNumber"] for r in parsed["records"]}
+        # Every record should have its row tracked in a batch
+        parsed_rows = {r["rowNumber"] for r in records_150}
         assert parsed_rows == all_source_rows, \
             f"Missing rows: {parsed_rows - all_source_rows}, Extra rows: {all_source_rows - parsed_rows}"
@@ -1,18 +1,38 @@
 """Tests for TICKET-P0: PRODA authentication service (corrected JWT claims)."""
 
+import asyncio
+import base64
+import os
 import time
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
+from urllib.parse import parse_qs
 
+import httpx
+import jks
+import jwt
 import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.serialization import (
+    BestAvailableEncryption,
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    pkcs12,
+)
 
 from app.config import Settings
 from app.middleware.error_handler import AuthenticationError
+from app.services import proda_auth
 from app.services.proda_auth import ProdaAuthService, TOKEN_REFRESH_BUFFER_SECONDS
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config():
-    return Settings(
+    """Shared, read-only; tests needing other values take a model_copy.
+
+    model_construct skips env/.env lookup and validation for these known values.
+    """
+    return Settings.model_construct(
         APP_ENV="vendor",
         PRODA_ORG_ID="2330016739",
         PRODA_DEVICE_NAME="DavidTestLaptop2",
@@ -25,10 +45,17 @@ def config():
         PRODA_ACCESS_TOKEN_AUDIENCE="https://proda.humanservices.gov.au",
         PRODA_TOKEN_ENDPOINT_VENDOR="https://vnd.proda.humanservices.gov.au/mga/sps/oauth/oauth20/token",
         PRODA_TOKEN_ENDPOINT_PROD="https://proda.humanservices.gov.au/mga/sps/oauth/oauth20/token",
-        _env_file=None,
     )
 
 
+@pytest.fixture(autouse=True)
+def _reset_shared_state():
+    """Each test starts without any token state shared between services."""
+    proda_auth._shared_states.clear()
+    yield
+    proda_auth._shared_states.clear()
+
+
 @pytest.fixture
 def service(config):
     return ProdaAuthService(config=config)
@@ -39,19 +66,19 @@ class TestTokenValidity:
         assert service.is_token_valid is False
 
     def test_expired_token_is_invalid(self, service):
-        service._access_token = "test-token"
-        service._token_expires_at = time.time() - 100
+        service._state.access_token = "test-token"
+        service._state.token_expires_at = time.monotonic() - 100
         assert service.is_token_valid is False
 
     def test_token_within_buffer_is_invalid(self, service):
-        service._access_token = "test-token"
+        service._state.access_token = "test-token"
         # Set expiry just within the buffer
-        service._token_expires_at = time.time() + TOKEN_REFRESH_BUFFER_SECONDS - 10
+        service._state.token_expires_at = time.monotonic() + TOKEN_REFRESH_BUFFER_SECONDS - 10
         assert service.is_token_valid is False
 
     def test_valid_token_outside_buffer(self, service):
-        service._access_token = "test-token"
-        service._token_expires_at = time.time() + TOKEN_REFRESH_BUFFER_SECONDS + 100
+        service._state.access_token = "test-token"
+        service._state.token_expires_at = time.monotonic() + TOKEN_REFRESH_BUFFER_SECONDS + 100
         assert service.is_token_valid is True
 
 
@@ -61,37 +88,50 @@ class TestGetAuthorizationHeader:
             service.get_authorization_header()
 
     def test_returns_bearer_header(self, service):
-        service._access_token = "my-token-123"
+        service._state.access_token = "my-token-123"
         assert service.get_authorization_header() == "Bearer my-token-123"
 
 
 class TestClearToken:
     def test_clears_token_and_expiry(self, service):
-        service._access_token = "token"
-        service._token_expires_at = time.time() + 3600
+        service._state.access_token = "token"
+        service._state.token_expires_at = time.monotonic() + 3600
         service.clear_token()
-        assert service._access_token is None
-        assert service._token_expires_at == 0.0
+        assert service._state.access_token is None
+        assert service._state.token_expires_at == 0.0
         assert service.is_token_valid is False
 
 
 class TestGetToken:
     @pytest.mark.asyncio
     async def test_returns_cached_token_if_valid(self, service):
-        service._access_token = "cached-token"
-        service._token_expires_at = time.time() + TOKEN_REFRESH_BUFFER_SECONDS + 100
+        service._state.access_token = "cached-token"
+        service._state.token_expires_at = time.monotonic() + TOKEN_REFRESH_BUFFER_SECONDS + 100
         token = await service.get_token()
         assert token == "cached-token"
 
     @pytest.mark.asyncio
     async def test_acquires_new_token_when_expired(self, service):
-        service._access_token = None
+        service._state.access_token = None
         with patch.object(service, "_acquire_token", new_callable=AsyncMock) as mock:
             mock.return_value = "new-token"
             token = await service.get_token()
             assert token == "new-token"
             mock.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_concurrent_get_token_single_refresh(self, service):
+        async def acquire():
+            await asyncio.sleep(0)
+            service._state.access_token = "new-token"
+            service._state.token_expires_at = time.monotonic() + 3600
+            return "new-token"
+
+        with patch.object(service, "_acquire_token", side_effect=acquire) as mock:
+            tokens = await asyncio.gather(*(service.get_token() for _ in range(10)))
+        assert tokens == ["new-token"] * 10
+        assert mock.call_count == 1
+
 
 class TestBuildAssertion:
     def test_raises_without_jks_config(self):
@@ -151,107 +191,234 @@ class TestBuildAssertion:
                 claims = mock_encode.call_args[0][0]
                 assert claims["sub"] == "DavidTestLaptop2"
 
+    def test_assertion_is_reused_within_window(self, service):
+        with patch.object(service, "_load_private_key", return_value=b"fake-key"):
+            with patch("jwt.encode", side_effect=["jwt-1", "jwt-2"]) as mock_encode:
+                assert service._build_assertion() == "jwt-1"
+                assert service._build_assertion() == "jwt-1"
+                mock_encode.assert_called_once()
+
+                # Close to its 10-minute expiry the assertion is re-signed
+                service._state.assertion_expires_at = time.monotonic() + 10
+                assert service._build_assertion() == "jwt-2"
+
+    def test_assertion_is_shared_across_instances(self, config):
+        with patch.object(ProdaAuthService, "_load_private_key", return_value=b"fake-key"), \
+                patch("jwt.encode", side_effect=["jwt-1", "jwt-2"]) as mock_encode:
+            assert ProdaAuthService(config=config)._build_assertion() == "jwt-1"
+            assert ProdaAuthService(config=config)._build_assertion() == "jwt-1"
+        mock_encode.assert_called_once()
+
+
+class TestSigningKeyCache:
+    @pytest.fixture(scope="class")
+    def rsa_key(self):
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    @pytest.fixture(scope="class", params=["pkcs12", "jks"])
+    def keystore(self, request, rsa_key) -> bytes:
+        if request.param == "pkcs12":
+            return pkcs12.serialize_key_and_certificates(
+                b"proda-alias", rsa_key, None, None, BestAvailableEncryption(b"Pass-123"),
+            )
+        der = rsa_key.private_bytes(Encoding.DER, PrivateFormat.PKCS8, NoEncryption())
+        entry = jks.PrivateKeyEntry.new("proda-alias", [], der, "pkcs8")
+        return jks.KeyStore.new("jks", [entry]).saves("Pass-123")
+
+    @pytest.fixture(scope="class")
+    def keystore_config(self, config, keystore):
+        return config.model_copy(
+            update={"PRODA_JKS_BASE64": base64.b64encode(keystore).decode()},
+        )
+
+    def test_keystore_is_unwrapped_once_across_instances(self, keystore_config, rsa_key):
+        """Routers build a service per request; only the first one unwraps the keystore."""
+        with patch.object(
+            ProdaAuthService, "_load_private_key", autospec=True,
+            side_effect=ProdaAuthService._load_private_key,
+        ) as mock_load:
+            first_service = ProdaAuthService(config=keystore_config)
+            first = first_service._build_assertion()
+            first_service._state.assertion = None  # force a second signature
+            second = ProdaAuthService(config=keystore_config)._build_assertion()
+        mock_load.assert_called_once()
+        for assertion in (first, second):
+            claims = jwt.decode(
+                assertion, rsa_key.public_key(), algorithms=["RS256"],
+                audience="https://proda.humanservices.gov.au",
+            )
+            assert claims["sub"] == "DavidTestLaptop2"
+
+    def test_jks_file_path_preferred_over_base64(self, config, keystore, rsa_key, tmp_path):
+        """The raw keystore file wins; the config fixture's base64 is not a keystore."""
+        path = tmp_path / "proda.keystore"
+        path.write_bytes(keystore)
+        service = ProdaAuthService(config=config.model_copy(
+            update={"PRODA_JKS_FILE_PATH": str(path)},
+        ))
+        assert service._load_private_key().private_numbers() == rsa_key.private_numbers()
+
+    def test_der_key_path_bypasses_jks(self, config, rsa_key, tmp_path):
+        path = tmp_path / "proda.der"
+        path.write_bytes(rsa_key.private_bytes(Encoding.DER, PrivateFormat.PKCS8, NoEncryption()))
+        service = ProdaAuthService(config=config.model_copy(
+            update={"PRODA_PRIVATE_KEY_DER_PATH": str(path)},
+        ))
+        with patch.object(service, "_load_from_jks") as jks_load, \
+                patch.object(service, "_load_from_pkcs12") as pkcs12_load:
+            key = service._load_private_key()
+        assert key.private_numbers() == rsa_key.private_numbers()
+        jks_load.assert_not_called()
+        pkcs12_load.assert_not_called()
+
+    def test_rewritten_keystore_is_picked_up(self, config, rsa_key, tmp_path):
+        """Rotating the keystore on disk replaces the cached key and assertion."""
+        def write_keystore(key, mtime_ns):
+            path.write_bytes(pkcs12.serialize_key_and_certificates(
+                b"proda-alias", key, None, None, BestAvailableEncryption(b"Pass-123"),
+            ))
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+        path = tmp_path / "proda.keystore"
+        write_keystore(rsa_key, 1_000_000_000)
+        keystore_config = config.model_copy(update={"PRODA_JKS_FILE_PATH": str(path)})
+        first = ProdaAuthService(config=keystore_config)._build_assertion()
+        jwt.decode(
+            first, rsa_key.public_key(), algorithms=["RS256"],
+            audience="https://proda.humanservices.gov.au",
+        )
+
+        rotated_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        write_keystore(rotated_key, 2_000_000_000)
+        second = ProdaAuthService(config=keystore_config)._build_assertion()
+        assert second != first
+        jwt.decode(
+            second, rotated_key.public_key(), algorithms=["RS256"],
+            audience="https://proda.humanservices.gov.au",
+        )
+
 
 class TestTokenEndpointSelection:
     def test_vendor_env_uses_vendor_endpoint(self, config):
-        config.APP_ENV = "vendor"
-        service = ProdaAuthService(config=config)
+        service = ProdaAuthService(config=config.model_copy(update={"APP_ENV": "vendor"}))
         assert service._get_token_endpoint() == "https://vnd.proda.humanservices.gov.au/mga/sps/oauth/oauth20/token"
 
     def test_production_env_uses_prod_endpoint(self, config):
-        config.APP_ENV = "production"
-        service = ProdaAuthService(config=config)
+        service = ProdaAuthService(config=config.model_copy(update={"APP_ENV": "production"}))
         assert service._get_token_endpoint() == "https://proda.humanservices.gov.au/mga/sps/oauth/oauth20/token"
 
 
+_TOKEN_BODY = {
+    "access_token": "acquired-token",
+    "token_type": "Bearer",
+    "expires_in": 3600,
+}
+
+
+@pytest.fixture
+def token_requests():
+    """Serve PRODA token POSTs from an httpx.MockTransport; yields the requests seen."""
+    seen: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        await asyncio.sleep(0)  # let concurrent callers reach the refresh lock
+        return httpx.Response(200, json=_TOKEN_BODY)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch.object(proda_auth, "_http_client", client):
+        yield seen
+
+
 class TestAcquireToken:
     @pytest.mark.asyncio
-    async def test_successful_token_acquisition(self, service):
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "access_token": "acquired-token",
-            "token_type": "Bearer",
-            "expires_in": 3600,
-        }
-        mock_response.raise_for_status = MagicMock()
-
+    async def test_successful_token_acquisition(self, service, token_requests):
         with patch.object(service, "_build_assertion", return_value="mock-assertion"):
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client.post.return_value = mock_response
-                mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-                mock_client.__aexit__ = AsyncMock(return_value=False)
-                mock_client_class.return_value = mock_client
-
-                token = await service._acquire_token()
-                assert token == "acquired-token"
-                assert service._access_token == "acquired-token"
-                assert service._token_expires_at > time.time()
+            token = await service._acquire_token()
+        assert token == "acquired-token"
+        assert service._state.access_token == "acquired-token"
+        assert time.monotonic() < service._state.token_expires_at <= time.monotonic() + 3600
+
+    @pytest.mark.asyncio
+    async def test_expiry_jitter_only_pulls_expiry_earlier(self, service, token_requests):
+        with patch.object(service, "_build_assertion", return_value="mock-assertion"), \
+                patch("app.services.proda_auth.random.uniform", return_value=0.05):
+            await service._acquire_token()
+        assert service._state.token_expires_at == pytest.approx(time.monotonic() + 3600 * 0.95, abs=1)
 
     @pytest.mark.asyncio
-    async def test_post_body_includes_client_id(self, service):
+    async def test_post_body_includes_client_id(self, service, token_requests):
         """POST body must include client_id parameter."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "access_token": "token",
-            "expires_in": 3600,
+        with patch.object(service, "_build_assertion", return_value="mock-assertion"):
+            await service._acquire_token()
+        form = parse_qs(token_requests[0].content.decode())
+        assert form == {
+            "grant_type": ["urn:ietf:params:oauth:grant-type:jwt-bearer"],
+            "client_id": ["soape-testing-client-v2"],
+            "assertion": ["mock-assertion"],
         }
-        mock_response.raise_for_status = MagicMock()
+        assert token_requests[0].headers["content-type"] == "application/x-www-form-urlencoded"
 
+    @pytest.mark.asyncio
+    async def test_post_uses_vendor_endpoint(self, service, token_requests):
+        """Token request should use vendor endpoint when APP_ENV=vendor."""
         with patch.object(service, "_build_assertion", return_value="mock-assertion"):
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client.post.return_value = mock_response
-                mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-                mock_client.__aexit__ = AsyncMock(return_value=False)
-                mock_client_class.return_value = mock_client
+            await service._acquire_token()
+        assert str(token_requests[0].url) == "https://vnd.proda.humanservices.gov.au/mga/sps/oauth/oauth20/token"
+
+    @pytest.mark.asyncio
+    async def test_token_is_cached_after_acquisition(self, service, token_requests):
+        with patch.object(service, "_build_assertion", return_value="mock"):
+            await service._acquire_token()
+        # Token should now be valid (cached)
+        assert service.is_token_valid is True
+        assert service.get_authorization_header() == "Bearer acquired-token"
 
-                await service._acquire_token()
 
-                post_call = mock_client.post.call_args
-                assert post_call[1]["data"]["client_id"] == "soape-testing-client-v2"
+class TestSharedTokenState:
+    """Routers build a ProdaAuthService per request; the token must outlive them."""
 
     @pytest.mark.asyncio
-    async def test_post_uses_vendor_endpoint(self, service):
-        """Token request should use vendor endpoint when APP_ENV=vendor."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "access_token": "token",
-            "expires_in": 3600,
-        }
-        mock_response.raise_for_status = MagicMock()
+    async def test_separate_instances_share_one_refresh(self, config, token_requests):
+        first, second = ProdaAuthService(config=config), ProdaAuthService(config=config)
+        with patch.object(ProdaAuthService, "_build_assertion", return_value="mock"):
+            tokens = await asyncio.gather(first.get_token(), second.get_token())
+        assert tokens == ["acquired-token", "acquired-token"]
+        assert len(token_requests) == 1
+        assert ProdaAuthService(config=config).is_token_valid is True
 
-        with patch.object(service, "_build_assertion", return_value="mock-assertion"):
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client.post.return_value = mock_response
-                mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-                mock_client.__aexit__ = AsyncMock(return_value=False)
-                mock_client_class.return_value = mock_client
+    @pytest.mark.asyncio
+    async def test_clear_token_applies_to_every_instance(self, config, token_requests):
+        service = ProdaAuthService(config=config)
+        with patch.object(ProdaAuthService, "_build_assertion", return_value="mock"):
+            await service.get_token()
+        ProdaAuthService(config=config).clear_token()
+        assert service.is_token_valid is False
 
-                await service._acquire_token()
+    def test_other_credentials_do_not_share(self, config, service):
+        service._state.access_token = "token"
+        service._state.token_expires_at = time.monotonic() + 3600
+        other = ProdaAuthService(config=config.model_copy(update={"PRODA_DEVICE_NAME": "Other"}))
+        assert other.is_token_valid is False
 
-                post_call = mock_client.post.call_args
-                assert post_call[0][0] == "https://vnd.proda.humanservices.gov.au/mga/sps/oauth/oauth20/token"
 
+class TestSharedHttpClient:
     @pytest.mark.asyncio
-    async def test_token_is_cached_after_acquisition(self, service):
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "access_token": "cached-me",
-            "expires_in": 3600,
-        }
-        mock_response.raise_for_status = MagicMock()
+    async def test_injected_client_replaces_shared_client(self, config):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=_TOKEN_BODY))
+        service = ProdaAuthService(
+            config=config, http_client=httpx.AsyncClient(transport=transport),
+        )
+        with patch.object(proda_auth, "_get_http_client") as shared, \
+                patch.object(service, "_build_assertion", return_value="mock"):
+            assert await service.get_token() == "acquired-token"
+        shared.assert_not_called()
 
-        with patch.object(service, "_build_assertion", return_value="mock"):
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = AsyncMock()
-                mock_client.post.return_value = mock_response
-                mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-                mock_client.__aexit__ = AsyncMock(return_value=False)
-                mock_client_class.return_value = mock_client
-
-                await service._acquire_token()
-                # Token should now be valid (cached)
-                assert service.is_token_valid is True
-                assert service.get_authorization_header() == "Bearer cached-me"
+    @pytest.mark.asyncio
+    async def test_client_is_reused_until_closed(self):
+        with patch.object(proda_auth, "_http_client", None):
+            client = proda_auth._get_http_client()
+            assert proda_auth._get_http_client() is client
+            await proda_auth.close_http_client()
+            assert client.is_closed
+            assert proda_auth._http_client is None
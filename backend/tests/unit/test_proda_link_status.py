@@ -3,6 +3,7 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 
 class TestUpdateProdaLinkStatus:
@@ -45,47 +46,45 @@ class TestLocationManagerProdaLinkStatus:
         db.add = MagicMock()
         return db
 
+    @staticmethod
+    def _rows_updated(mock_db, rowcount: int) -> None:
+        mock_db.execute.return_value = MagicMock(rowcount=rowcount)
+
     @pytest.mark.asyncio
     async def test_updates_pending_to_linked(self, mock_db):
         from app.services.location_manager import LocationManager
 
-        mock_loc = MagicMock()
-        mock_loc.id = 1
-        mock_loc.proda_link_status = "pending"
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_loc
-        mock_db.execute.return_value = mock_result
+        self._rows_updated(mock_db, 1)
 
         mgr = LocationManager(mock_db)
         await mgr.update_proda_link_status(1, "linked")
 
-        assert mock_loc.proda_link_status == "linked"
+        stmt = mock_db.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE locations SET proda_link_status=")
+        assert "IS DISTINCT FROM" in sql
+        mock_db.execute.assert_called_once()
         mock_db.commit.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_skips_if_already_linked(self, mock_db):
         from app.services.location_manager import LocationManager
 
-        mock_loc = MagicMock()
-        mock_loc.id = 1
-        mock_loc.proda_link_status = "linked"
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_loc
-        mock_db.execute.return_value = mock_result
+        # The conditional UPDATE matches nothing when the status is already set
+        self._rows_updated(mock_db, 0)
 
         mgr = LocationManager(mock_db)
         await mgr.update_proda_link_status(1, "linked")
 
-        # Should NOT commit since status is already "linked"
+        # One statement, no SELECT, and no commit since nothing changed
+        mock_db.execute.assert_called_once()
         mock_db.commit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_no_error_on_missing_location(self, mock_db):
         from app.services.location_manager import LocationManager
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute.return_value = mock_result
+        self._rows_updated(mock_db, 0)
 
         mgr = LocationManager(mock_db)
         # Should not raise
@@ -101,12 +100,7 @@ class TestLocationManagerProdaLinkStatus:
         """
         from app.services.location_manager import LocationManager
 
-        mock_loc = MagicMock()
-        mock_loc.id = 1
-        mock_loc.proda_link_status = "pending"
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_loc
-        mock_db.execute.return_value = mock_result
+        self._rows_updated(mock_db, 0)
 
         mgr = LocationManager(mock_db)
         # Calling with same status as existing = no change
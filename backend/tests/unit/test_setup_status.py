@@ -1,32 +1,52 @@
 """Tests for GET /api/locations/{id}/setup-status endpoint."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.routers.locations import get_location_manager
+
+
+def _fake_location(**overrides) -> SimpleNamespace:
+    """Plain stand-in for a Location row; tests override only what they check."""
+    fields = {
+        "id": 1,
+        "organisation_id": 1,
+        "name": "Test Clinic",
+        "address_line_1": "",
+        "address_line_2": "",
+        "suburb": "Sydney",
+        "state": "NSW",
+        "postcode": "2000",
+        "minor_id": "MI-001",
+        "proda_link_status": "pending",
+        "status": "active",
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "updated_at": "2026-01-01T00:00:00+00:00",
+        "providers": [],
+    }
+    return SimpleNamespace(**(fields | overrides))
+
+
+def _provider(provider_id: int, number: str, created_at: datetime) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=provider_id, location_id=1, provider_number=number, provider_type="GP",
+        minor_id="MI-002", hw027_status="approved", air_access_list=None,
+        created_at=created_at, updated_at=created_at,
+    )
+
 
 class TestSetupStatusEndpoint:
-    @pytest.fixture
-    def client(self):
+    @pytest.fixture(scope="class")
+    def app(self):
+        """Built once for the class; tests only swap the LocationManager override."""
         from app.main import create_app
-        from app.database import get_db
         from app.dependencies import get_current_user
 
-        app = create_app()
-
-        # Create a proper mock DB that handles both LocationManager and direct queries
-        mock_db = AsyncMock()
-
-        # Default: return empty scalars for the providers query
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = []
-        mock_execute_result = MagicMock()
-        mock_execute_result.scalars.return_value = mock_scalars
-        mock_db.execute.return_value = mock_execute_result
-
-        async def override_db():
-            yield mock_db
+        app = create_app(with_middleware=False)
 
         mock_user = MagicMock()
         mock_user.id = 1
@@ -36,40 +56,28 @@ class TestSetupStatusEndpoint:
         async def mock_auth():
             return mock_user
 
-        app.dependency_overrides[get_db] = override_db
         app.dependency_overrides[get_current_user] = mock_auth
+        return app
+
+    @pytest.fixture(scope="class")
+    def client(self, app):
         return TestClient(app)
 
-    @patch("app.routers.locations.LocationManager")
-    def test_returns_404_for_nonexistent_location(self, MockManager, client):
-        mock_mgr = AsyncMock()
+    @pytest.fixture
+    def mock_mgr(self, app):
+        mgr = AsyncMock()
+        app.dependency_overrides[get_location_manager] = lambda: mgr
+        yield mgr
+        del app.dependency_overrides[get_location_manager]
+
+    def test_returns_404_for_nonexistent_location(self, mock_mgr, client):
         mock_mgr.get.return_value = None
-        MockManager.return_value = mock_mgr
 
         response = client.get("/api/locations/999/setup-status")
         assert response.status_code == 404
 
-    @patch("app.routers.locations.LocationManager")
-    def test_returns_setup_status_for_valid_location(self, MockManager, client):
-        # Mock location
-        mock_loc = MagicMock()
-        mock_loc.id = 1
-        mock_loc.organisation_id = 1
-        mock_loc.name = "Test Clinic"
-        mock_loc.address_line_1 = ""
-        mock_loc.address_line_2 = ""
-        mock_loc.suburb = "Sydney"
-        mock_loc.state = "NSW"
-        mock_loc.postcode = "2000"
-        mock_loc.minor_id = "MI-001"
-        mock_loc.proda_link_status = "pending"
-        mock_loc.status = "active"
-        mock_loc.created_at = "2026-01-01T00:00:00+00:00"
-        mock_loc.updated_at = "2026-01-01T00:00:00+00:00"
-
-        mock_mgr = AsyncMock()
-        mock_mgr.get.return_value = mock_loc
-        MockManager.return_value = mock_mgr
+    def test_returns_setup_status_for_valid_location(self, mock_mgr, client):
+        mock_mgr.get.return_value = _fake_location()
 
         response = client.get("/api/locations/1/setup-status")
         assert response.status_code == 200
@@ -81,33 +89,25 @@ class TestSetupStatusEndpoint:
         assert data["steps"]["providerLinked"]["complete"] is False
         assert data["steps"]["prodaLink"]["status"] == "pending"
 
-    @patch("app.routers.locations.LocationManager")
-    def test_returns_complete_when_proda_linked_and_has_provider(self, MockManager, client):
+    def test_returns_complete_when_proda_linked_and_has_provider(self, mock_mgr, client):
         """Setup is complete when location exists, has provider, and PRODA linked."""
-        mock_loc = MagicMock()
-        mock_loc.id = 1
-        mock_loc.organisation_id = 1
-        mock_loc.name = "Complete Clinic"
-        mock_loc.address_line_1 = "1 Main St"
-        mock_loc.address_line_2 = ""
-        mock_loc.suburb = "Sydney"
-        mock_loc.state = "NSW"
-        mock_loc.postcode = "2000"
-        mock_loc.minor_id = "MI-002"
-        mock_loc.proda_link_status = "linked"
-        mock_loc.status = "active"
-        mock_loc.created_at = "2026-01-01T00:00:00+00:00"
-        mock_loc.updated_at = "2026-01-01T00:00:00+00:00"
-
-        mock_mgr = AsyncMock()
-        mock_mgr.get.return_value = mock_loc
-        MockManager.return_value = mock_mgr
-
-        # This test doesn't have providers in the mock, so setupComplete
-        # will be False (no providers). But it tests that the endpoint works.
+        mock_mgr.get.return_value = _fake_location(
+            name="Complete Clinic",
+            address_line_1="1 Main St",
+            minor_id="MI-002",
+            proda_link_status="linked",
+            # Loaded out of order; the endpoint lists providers oldest first
+            providers=[
+                _provider(2, "2222222B", datetime(2026, 1, 3)),
+                _provider(1, "1111111A", datetime(2026, 1, 2)),
+            ],
+        )
+
         response = client.get("/api/locations/1/setup-status")
         assert response.status_code == 200
         data = response.json()
+        assert data["setupComplete"] is True
+        assert [p["provider_number"] for p in data["providers"]] == ["1111111A", "2222222B"]
         assert data["steps"]["prodaLink"]["complete"] is True
         assert data["steps"]["prodaLink"]["status"] == "linked"
 
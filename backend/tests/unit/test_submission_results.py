@@ -1,5 +1,7 @@
 """Tests for submission results API endpoints (DEV-001)."""
 
+import csv
+import io
 import json
 import pytest
 from pathlib import Path
@@ -9,18 +11,28 @@ from httpx import ASGITransport, AsyncClient
 from app.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def anyio_backend():
     return "asyncio"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 async def client():
+    """One client for the module; per-test state lives in mock_store."""
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
 
+@pytest.fixture
+def mock_store():
+    """Replace the router's SubmissionStore for one test (unknown ids by default)."""
+    with patch("app.routers.submission_results._store") as store:
+        store.load_metadata.return_value = None
+        store._base = Path("/tmp/test")
+        yield store
+
+
 @pytest.fixture
 def mock_submission_data():
     """Sample submission metadata as stored on disk."""
@@ -120,22 +132,20 @@ def mock_request_payload():
 
 
 @pytest.mark.anyio
-async def test_get_results_not_found(client):
+async def test_get_results_not_found(client, mock_store):
     """Should return 404 for non-existent submission."""
     response = await client.get("/api/submissions/nonexistent-id/results")
     assert response.status_code == 404
 
 
 @pytest.mark.anyio
-async def test_get_results_success(client, mock_submission_data, mock_request_payload):
+async def test_get_results_success(client, mock_store, mock_submission_data, mock_request_payload):
     """Should return detailed results for a valid submission."""
-    with patch("app.routers.submission_results._store") as mock_store:
-        mock_store.load_metadata.return_value = mock_submission_data
-        mock_store._base = Path("/tmp/test")
+    mock_store.load_metadata.return_value = mock_submission_data
 
-        # Mock payload loading to return None (use rawResponse fallback)
-        with patch("app.routers.submission_results._load_payload", return_value=None):
-            response = await client.get("/api/submissions/test-id/results")
+    # Mock payload loading to return None (use rawResponse fallback)
+    with patch("app.routers.submission_results._load_payload", return_value=None):
+        response = await client.get("/api/submissions/test-id/results")
 
     assert response.status_code == 200
     data = response.json()
@@ -162,14 +172,12 @@ async def test_get_results_success(client, mock_submission_data, mock_request_pa
 
 
 @pytest.mark.anyio
-async def test_get_results_with_status_filter(client, mock_submission_data):
+async def test_get_results_with_status_filter(client, mock_store, mock_submission_data):
     """Should filter records by status."""
-    with patch("app.routers.submission_results._store") as mock_store:
-        mock_store.load_metadata.return_value = mock_submission_data
-        mock_store._base = Path("/tmp/test")
+    mock_store.load_metadata.return_value = mock_submission_data
 
-        with patch("app.routers.submission_results._load_payload", return_value=None):
-            response = await client.get("/api/submissions/test-id/results?status=ERROR")
+    with patch("app.routers.submission_results._load_payload", return_value=None):
+        response = await client.get("/api/submissions/test-id/results?status=ERROR")
 
     data = response.json()
     assert len(data["records"]) == 1
@@ -179,14 +187,12 @@ async def test_get_results_with_status_filter(client, mock_submission_data):
 
 
 @pytest.mark.anyio
-async def test_get_results_pagination(client, mock_submission_data):
+async def test_get_results_pagination(client, mock_store, mock_submission_data):
     """Should paginate results."""
-    with patch("app.routers.submission_results._store") as mock_store:
-        mock_store.load_metadata.return_value = mock_submission_data
-        mock_store._base = Path("/tmp/test")
+    mock_store.load_metadata.return_value = mock_submission_data
 
-        with patch("app.routers.submission_results._load_payload", return_value=None):
-            response = await client.get("/api/submissions/test-id/results?page=1&page_size=1")
+    with patch("app.routers.submission_results._load_payload", return_value=None):
+        response = await client.get("/api/submissions/test-id/results?page=1&page_size=1")
 
     data = response.json()
     assert len(data["records"]) == 1
@@ -197,7 +203,7 @@ async def test_get_results_pagination(client, mock_submission_data):
 
 
 @pytest.mark.anyio
-async def test_verbatim_message_preserved(client):
+async def test_verbatim_message_preserved(client, mock_store):
     """CRITICAL: AIR messages must be returned verbatim, never modified."""
     verbatim_msg = "  Exact AIR message with <special> chars & 'quotes' — do NOT modify  "
     metadata = {
@@ -215,19 +221,17 @@ async def test_verbatim_message_preserved(client):
         },
     }
 
-    with patch("app.routers.submission_results._store") as mock_store:
-        mock_store.load_metadata.return_value = metadata
-        mock_store._base = Path("/tmp/test")
+    mock_store.load_metadata.return_value = metadata
 
-        with patch("app.routers.submission_results._load_payload", return_value=None):
-            response = await client.get("/api/submissions/test-id/results")
+    with patch("app.routers.submission_results._load_payload", return_value=None):
+        response = await client.get("/api/submissions/test-id/results")
 
     data = response.json()
     assert data["records"][0]["airMessage"] == verbatim_msg
 
 
 @pytest.mark.anyio
-async def test_get_results_with_stored_payloads(client, mock_submission_data, mock_request_payload):
+async def test_get_results_with_stored_payloads(client, mock_store, mock_submission_data, mock_request_payload):
     """Should use stored payloads when available for richer data."""
     stored_response = {
         "statusCode": "AIR-I-1007",
@@ -253,12 +257,10 @@ async def test_get_results_with_stored_payloads(client, mock_submission_data, mo
             return stored_response
         return None
 
-    with patch("app.routers.submission_results._store") as mock_store:
-        mock_store.load_metadata.return_value = mock_submission_data
-        mock_store._base = Path("/tmp/test")
+    mock_store.load_metadata.return_value = mock_submission_data
 
-        with patch("app.routers.submission_results._load_payload", side_effect=load_payload_side_effect):
-            response = await client.get("/api/submissions/test-id/results")
+    with patch("app.routers.submission_results._load_payload", side_effect=load_payload_side_effect):
+        response = await client.get("/api/submissions/test-id/results")
 
     data = response.json()
     rec0 = data["records"][0]
@@ -270,21 +272,19 @@ async def test_get_results_with_stored_payloads(client, mock_submission_data, mo
 
 
 @pytest.mark.anyio
-async def test_export_not_found(client):
+async def test_export_not_found(client, mock_store):
     """Should return 404 for non-existent submission."""
     response = await client.get("/api/submissions/nonexistent-id/export")
     assert response.status_code == 404
 
 
 @pytest.mark.anyio
-async def test_export_csv(client, mock_submission_data):
+async def test_export_csv(client, mock_store, mock_submission_data):
     """Should return a CSV with headers and detail rows."""
-    with patch("app.routers.submission_results._store") as mock_store:
-        mock_store.load_metadata.return_value = mock_submission_data
-        mock_store._base = Path("/tmp/test")
+    mock_store.load_metadata.return_value = mock_submission_data
 
-        with patch("app.routers.submission_results._load_payload", return_value=None):
-            response = await client.get("/api/submissions/test-id/export")
+    with patch("app.routers.submission_results._load_payload", return_value=None):
+        response = await client.get("/api/submissions/test-id/export")
 
     assert response.status_code == 200
     assert response.headers["content-type"] == "text/csv; charset=utf-8"
@@ -302,7 +302,7 @@ async def test_export_csv(client, mock_submission_data):
 
 
 @pytest.mark.anyio
-async def test_export_csv_verbatim_message(client):
+async def test_export_csv_verbatim_message(client, mock_store):
     """CRITICAL: Exported CSV must contain verbatim AIR messages."""
     verbatim_msg = "Exact message with special chars"
     metadata = {
@@ -320,12 +320,39 @@ async def test_export_csv_verbatim_message(client):
         },
     }
 
-    with patch("app.routers.submission_results._store") as mock_store:
-        mock_store.load_metadata.return_value = metadata
-        mock_store._base = Path("/tmp/test")
+    mock_store.load_metadata.return_value = metadata
 
-        with patch("app.routers.submission_results._load_payload", return_value=None):
-            response = await client.get("/api/submissions/test-id/export")
+    with patch("app.routers.submission_results._load_payload", return_value=None):
+        response = await client.get("/api/submissions/test-id/export")
 
     assert response.status_code == 200
     assert verbatim_msg in response.text
+
+
+@pytest.mark.anyio
+async def test_export_csv_spans_multiple_chunks(client, mock_store):
+    """Large exports stream in chunks without dropping or splitting rows."""
+    metadata = {
+        "status": "completed",
+        "completedAt": "2026-02-09T10:00:00+00:00",
+        "results": {
+            "results": [
+                {
+                    "status": "error",
+                    "sourceRows": [i],
+                    "rawResponse": {"statusCode": "AIR-E-1005", "message": f"msg, {i}"},
+                }
+                for i in range(1, 251)
+            ],
+        },
+    }
+    mock_store.load_metadata.return_value = metadata
+
+    with patch("app.routers.submission_results._load_payload", return_value=None):
+        response = await client.get("/api/submissions/test-id/export")
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[6] == ["250", "0", "0", "250"]
+    detail = rows[9:]
+    assert [r[0] for r in detail] == [str(i) for i in range(1, 251)]
+    assert detail[-1][3] == "msg, 250"
@@ -1,10 +1,14 @@
 """Tests for SubmissionStore JSON file persistence."""
 
 import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from app.config import settings
 from app.services.submission_store import SubmissionStore
 
 
@@ -67,6 +71,46 @@ class TestSaveLoadMetadata:
         data = json.loads(path.read_text())
         assert data["status"] == "completed"
 
+    def test_matches_stdlib_json_encoding(self, store: SubmissionStore, tmp_path: Path) -> None:
+        """Non-str keys and datetimes are written as json.dumps(default=str) would."""
+        data = {"when": datetime(2026, 2, 9, 10, 0, tzinfo=timezone.utc), "byRow": {2: "ok"}}
+        store.save_metadata("sub-003", data)
+        written = json.loads((tmp_path / "sub-003" / "metadata.json").read_text())
+        assert written == json.loads(json.dumps(data, default=str))
+
+    def test_overwrite_leaves_no_temp_file(self, store: SubmissionStore, tmp_path: Path, sample_metadata: dict) -> None:
+        store.save_metadata("sub-004", sample_metadata)
+        store.save_metadata("sub-004", {**sample_metadata, "status": "error"})
+        assert [f.name for f in (tmp_path / "sub-004").iterdir()] == ["metadata.json"]
+
+    def test_concurrent_saves_do_not_share_temp_file(
+        self, store: SubmissionStore, tmp_path: Path, sample_metadata: dict
+    ) -> None:
+        statuses = [f"status-{i}" for i in range(50)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(
+                lambda status: store.save_metadata("sub-006", {**sample_metadata, "status": status}),
+                statuses,
+            ))
+        assert store.load_metadata("sub-006")["status"] in statuses
+        assert [f.name for f in (tmp_path / "sub-006").iterdir()] == ["metadata.json"]
+
+    def test_failed_save_removes_temp_file(
+        self, store: SubmissionStore, tmp_path: Path, sample_metadata: dict
+    ) -> None:
+        with patch("os.replace", side_effect=OSError("disk full")), pytest.raises(OSError):
+            store.save_metadata("sub-007", sample_metadata)
+        assert list((tmp_path / "sub-007").iterdir()) == []
+
+    @pytest.mark.parametrize("durable, fsyncs", [(False, 0), (True, 1)])
+    def test_fsync_only_when_durable(
+        self, store: SubmissionStore, sample_metadata: dict, durable: bool, fsyncs: int
+    ) -> None:
+        with patch.object(settings, "AIR_DURABLE", durable), patch("os.fsync") as fsync:
+            store.save_metadata("sub-005", sample_metadata)
+        assert fsync.call_count == fsyncs
+        assert store.load_metadata("sub-005") == sample_metadata
+
     def test_corrupt_json_returns_none(self, store: SubmissionStore, tmp_path: Path) -> None:
         sub_dir = tmp_path / "corrupt-sub"
         sub_dir.mkdir()
@@ -96,6 +140,16 @@ class TestLoadAllMetadata:
         (tmp_path / "empty-sub").mkdir()
         assert store.load_all_metadata() == {}
 
+    def test_returns_sorted_by_submission_id(self, store: SubmissionStore, sample_metadata: dict) -> None:
+        for sub_id in ("ccc", "aaa", "bbb"):
+            store.save_metadata(sub_id, sample_metadata)
+        assert list(store.load_all_metadata()) == ["aaa", "bbb", "ccc"]
+
+    def test_base_removed_after_init(self, tmp_path: Path) -> None:
+        store = SubmissionStore(base_dir=tmp_path / "gone")
+        (tmp_path / "gone").rmdir()
+        assert store.load_all_metadata() == {}
+
 
 # ============================================================================
 # Payload Tests
@@ -61,6 +61,10 @@ class TestMedicareCheckDigit:
     def test_issue_number_zero(self) -> None:
         assert validate_medicare_check_digit("2123456700") is False
 
+    @pytest.mark.parametrize("number", ["2123456701\n", "２１２３４５６７０１", "212345670\u00b9"])
+    def test_rejects_non_ascii_digits_and_trailing_newline(self, number: str) -> None:
+        assert validate_medicare_check_digit(number) is False
+
     def test_empty_string(self) -> None:
         assert validate_medicare_check_digit("") is False
 
@@ -95,6 +99,16 @@ class TestMedicareProviderNumber:
         assert validate_medicare_provider_number("2448141T") is True
         assert validate_medicare_provider_number("2448151L") is True
 
+    def test_lowercase_and_padding_normalised(self) -> None:
+        assert validate_medicare_provider_number(" 2448141t ") is True
+
+    def test_seven_char_accepts_any_plc(self) -> None:
+        assert validate_medicare_provider_number("1234567") is True
+        assert validate_medicare_provider_number("123456-") is True
+
+    def test_eight_char_plc_must_be_alphanumeric(self) -> None:
+        assert validate_medicare_provider_number("123456-A") is False
+
 
 class TestAIRProviderNumber:
     """Test AIR provider number format validation."""
@@ -114,6 +128,12 @@ class TestAIRProviderNumber:
     def test_valid_8_char(self) -> None:
         assert validate_air_provider_number("T59433Y ") is True
 
+    def test_lowercase_normalised(self) -> None:
+        assert validate_air_provider_number("n56725j") is True
+
+    def test_check_digit_must_be_alpha(self) -> None:
+        assert validate_air_provider_number("N567251") is False
+
     def test_official_sa_test_numbers(self) -> None:
         """Official Services Australia test provider numbers must pass."""
         assert validate_air_provider_number("N56725J") is True